@@ -3,11 +3,189 @@
 基于ruru.txt策略文档实现
 """
 import random
-from typing import List, Optional, Dict, Set
-from collections import Counter
+from typing import List, Optional, Dict, Set, Tuple
+from collections import defaultdict
+from functools import lru_cache
 from itertools import combinations
+from operator import attrgetter
 
-from shared_types import Card, CardValue, Suit, PlayType
+from shared_types import (Card, CardValue, Suit, PlayType, RANK_INDEX, RANK_VALUES, count_vector, without_cards,
+                          PT_BOMB, PT_ROCKET, STRAIGHT_MASK, bit_indices, find_sequences)
+
+
+def _group_by_rank(cards: List[Card]) -> List[List[Card]]:
+    """按牌值下标分组（组内保持手牌顺序）"""
+    by_rank = [[] for _ in range(15)]
+    for card in cards:
+        by_rank[RANK_INDEX[card.value]].append(card)
+    return by_rank
+
+
+def _map_to_hand(cards: List[Card], enumerate_templates, *args) -> List[List[Card]]:
+    """按手牌的计数签名取出缓存的牌型模板，再映射回当前手牌中的具体卡牌
+    
+    enumerate_templates 接收计数签名，返回 (牌值下标, 组内第几张) 模板，并按签名缓存。
+    """
+    by_rank = _group_by_rank(cards)
+    signature = bytes(len(group) for group in by_rank)
+    return [[by_rank[rank][nth] for rank, nth in move]
+            for move in enumerate_templates(signature, *args)]
+
+
+def _is_run(mask: int) -> bool:
+    """掩码中置位的牌值是否恰好连成一段"""
+    run_length = mask.bit_count()
+    end = mask.bit_length() - 1
+    full = ((1 << run_length) - 1) << (end - run_length + 1)
+    return mask == full
+
+
+def _rank_mask(counts: bytes, min_count: int) -> int:
+    """张数≥min_count 的牌值位掩码"""
+    mask = 0
+    for rank, cnt in enumerate(counts):
+        if cnt >= min_count:
+            mask |= 1 << rank
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def _analyze_counts(counts: bytes) -> Tuple[PlayType, CardValue]:
+    """按计数向量识别牌型，返回(牌型, 牌型值)
+    
+    牌型只取决于各牌值的张数，因此按计数签名缓存识别结果。
+    """
+    length = sum(counts)
+    # 按出现次数分桶：张数 -> [牌值]（各桶内按牌值从小到大）
+    by_mult = defaultdict(list)
+    # 张数≥1/≥2/≥3 的牌值位掩码（第 i 位对应牌值下标 i）
+    presence = pair_mask = trio_mask = 0
+    for index, cnt in enumerate(counts):
+        if cnt:
+            by_mult[cnt].append(RANK_VALUES[index])
+            max_value = RANK_VALUES[index]
+            bit = 1 << index
+            presence |= bit
+            if cnt >= 2:
+                pair_mask |= bit
+            if cnt >= 3:
+                trio_mask |= bit
+    
+    if length == 1:
+        return PlayType.SINGLE, max_value
+    
+    if length == 2:
+        if by_mult.get(2):
+            return PlayType.PAIR, max_value
+        
+        if counts[RANK_INDEX[CardValue.SMALL_JOKER]] and counts[RANK_INDEX[CardValue.BIG_JOKER]]:
+            return PlayType.ROCKET, CardValue.BIG_JOKER
+    
+    if length == 4 and by_mult.get(4):
+        return PlayType.BOMB, max_value
+    
+    if by_mult.get(3):
+        trio_value = by_mult[3][0]
+        
+        if length == 3:
+            return PlayType.TRIO, trio_value
+        
+        if length == 4:
+            return PlayType.TRIO_SINGLE, trio_value
+        
+        if length == 5:
+            if by_mult.get(2):
+                return PlayType.TRIO_PAIR, trio_value
+            if len(by_mult.get(1, ())) == 2:
+                return PlayType.TRIO_SINGLE, trio_value
+    
+    if by_mult.get(2) and length >= 6:
+        pair_count = pair_mask.bit_count()
+        if pair_count >= 3 and pair_count * 2 == length and _is_run(pair_mask):
+            return PlayType.PAIR_STRAIGHT, RANK_VALUES[pair_mask.bit_length() - 1]
+    
+    # 顺子：全是单张、连续且不含2和王
+    if length >= 5 and len(by_mult[1]) == length:
+        if presence & ~STRAIGHT_MASK == 0 and _is_run(presence):
+            return PlayType.STRAIGHT, max_value
+    
+    if by_mult.get(3) and _is_run(trio_mask):
+        trio_count = trio_mask.bit_count()
+        top_trio = RANK_VALUES[trio_mask.bit_length() - 1]
+        wing_count = length - trio_count * 3
+        if wing_count == 0:
+            return PlayType.PLANE, top_trio
+        
+        if wing_count == trio_count:
+            if len(by_mult[1]) == wing_count:
+                return PlayType.PLANE_SINGLE, top_trio
+        
+        if wing_count == trio_count * 2:
+            if pair_mask.bit_count() == trio_count:
+                return PlayType.PLANE_PAIR, top_trio
+    
+    if length == 6 and by_mult.get(4):
+        return PlayType.FOUR_WITH_TWO, max_value
+    
+    return PlayType.SINGLE, max_value
+
+
+@lru_cache(maxsize=4096)
+def _play_code(counts: bytes) -> Tuple[int, int]:
+    """_analyze_counts 的整数形式：(牌型编号, 牌值)，供出牌比较使用"""
+    play_type, value = _analyze_counts(counts)
+    return play_type.value, value.value
+
+
+@lru_cache(maxsize=4096)
+def _straight_templates(counts: bytes, min_length: int = 5) -> tuple:
+    """按计数签名枚举单顺模板"""
+    mask = _rank_mask(counts, 1) & STRAIGHT_MASK
+    return tuple(tuple((rank, 0) for rank in range(start, start + length))
+                 for length, start in find_sequences(mask, min_length))
+
+
+@lru_cache(maxsize=4096)
+def _pair_straight_templates(counts: bytes, min_pairs: int = 3) -> tuple:
+    """按计数签名枚举双顺模板"""
+    return tuple(tuple((rank, nth) for rank in range(start, start + length) for nth in range(2))
+                 for length, start in find_sequences(_rank_mask(counts, 2), min_pairs))
+
+
+@lru_cache(maxsize=4096)
+def _plane_templates(counts: bytes, min_groups: int = 2) -> tuple:
+    """按计数签名枚举纯飞机模板"""
+    return tuple(tuple((rank, nth) for rank in range(start, start + length) for nth in range(3))
+                 for length, start in find_sequences(_rank_mask(counts, 3), min_groups))
+
+
+@lru_cache(maxsize=4096)
+def _plane_with_wings_templates(counts: bytes) -> tuple:
+    """按计数签名枚举飞机带翅膀模板"""
+    planes = []
+    all_mask = _rank_mask(counts, 1)
+    pair_mask = _rank_mask(counts, 2)
+    
+    for trio_count, start in find_sequences(_rank_mask(counts, 3), 2):
+        plane_mask = ((1 << trio_count) - 1) << start
+        trio_cards = tuple((rank, nth) for rank in bit_indices(plane_mask) for nth in range(3))
+        
+        remaining = [(rank, nth) for rank in bit_indices(all_mask & ~plane_mask)
+                     for nth in range(counts[rank])]
+        
+        single_count = trio_count
+        if len(remaining) >= single_count:
+            for singles in combinations(remaining, single_count):
+                planes.append(trio_cards + singles)
+        
+        pair_ranks = bit_indices(pair_mask & ~plane_mask)
+        if len(pair_ranks) >= trio_count and len(remaining) >= trio_count * 2:
+            for i in range(len(pair_ranks) - trio_count + 1):
+                selected_pairs = pair_ranks[i:i + trio_count]
+                pair_cards = tuple((rank, nth) for rank in selected_pairs for nth in range(2))
+                planes.append(trio_cards + pair_cards)
+    
+    return tuple(planes)
 
 
 class DoudizhuAI:
@@ -151,75 +329,31 @@ class DoudizhuAI:
         if not cards:
             return 0
         
-        counts = Counter(c.value for c in cards)
-        combinations = 0
+        counts = count_vector(cards)
+        presence = pair_mask = 0
+        for index, cnt in enumerate(counts):
+            if cnt:
+                presence |= 1 << index
+            if cnt >= 2:
+                pair_mask |= 1 << index
         
-        for value, count in counts.items():
-            if value in [CardValue.SMALL_JOKER, CardValue.BIG_JOKER]:
-                combinations += count
-            elif count == 4:
-                combinations += 1
-            elif count == 3:
-                combinations += 1
-            elif count == 2:
-                combinations += 1
-            elif count == 1:
-                combinations += 1
-        
-        pair_count = sum(1 for c in counts.values() if c >= 2)
-        single_count = sum(1 for c in counts.values() if c == 1)
-        
-        trio_count = sum(1 for c in counts.values() if c >= 3)
-        for _ in range(trio_count):
-            remaining = [c for c in cards if c.value not in 
-                        [v for v, cnt in counts.items() if cnt >= 3]]
-            pair_vals = [v for v, cnt in Counter(c.value for c in remaining).items() if cnt >= 2]
-            single_vals = [v for v, cnt in Counter(c.value for c in remaining).items() if cnt == 1]
-            
-            has_plane = False
-            if len(pair_vals) >= 2:
-                sorted_pairs = sorted(pair_vals, key=lambda v: v.value)
-                for i in range(len(sorted_pairs) - 1):
-                    if sorted_pairs[i+1].value == sorted_pairs[i].value + 1:
-                        has_plane = True
-                        break
-            
-            if has_plane:
-                continue
-            break
-        
-        straight_possible = True
-        if len(cards) >= 5:
-            valid_vals = [v for v in counts.keys() 
-                         if v.value < CardValue.TWO.value 
-                         and v not in [CardValue.SMALL_JOKER, CardValue.BIG_JOKER]]
-            sorted_vals = sorted(valid_vals, key=lambda v: v.value)
-            for i in range(len(sorted_vals) - 1):
-                if sorted_vals[i+1].value != sorted_vals[i].value + 1:
-                    straight_possible = False
-                    break
-            if straight_possible and len(sorted_vals) >= 5:
-                return 1
-        
-        pair_straight_possible = True
-        pair_vals = [v for v, cnt in counts.items() if cnt >= 2 
-                    and v.value < CardValue.TWO.value]
-        if len(pair_vals) >= 3:
-            sorted_pairs = sorted(pair_vals, key=lambda v: v.value)
-            for i in range(len(sorted_pairs) - 1):
-                if sorted_pairs[i+1].value != sorted_pairs[i].value + 1:
-                    pair_straight_possible = False
-                    break
-            if pair_straight_possible:
-                return len(sorted_pairs)
-        
-        return len([c for c in counts.values() if c > 0])
+        # 3..A 能连成一条顺子
+        straight_mask = presence & STRAIGHT_MASK
+        if straight_mask.bit_count() >= 5 and _is_run(straight_mask):
+            return 1
+        
+        # 3..A 的对子能连成一条连对
+        pair_mask &= STRAIGHT_MASK
+        if pair_mask.bit_count() >= 3 and _is_run(pair_mask):
+            return pair_mask.bit_count()
+        
+        return presence.bit_count()
     
     @staticmethod
     def _calculate_hand_optimization_weight(cards: List[Card], move: List[Card], 
                                             current_combinations: int) -> float:
         """计算手牌优化权重 W₂"""
-        remaining = [c for c in cards if c not in move]
+        remaining = without_cards(cards, move)
         new_combinations = DoudizhuAI._count_combinations(remaining)
         return (current_combinations - new_combinations) * 2.0
     
@@ -291,7 +425,7 @@ class DoudizhuAI:
         base_type, base_value = DoudizhuAI._analyze_play(move)
         base_weight = DoudizhuAI._calculate_base_weight(base_type, move) * 2.0
         
-        remaining = [c for c in player_cards if c not in move]
+        remaining = without_cards(player_cards, move)
         
         if len(remaining) == 0:
             finish_prob = 1.0
@@ -336,7 +470,7 @@ class DoudizhuAI:
         if play_type != PlayType.BOMB and play_type != PlayType.ROCKET:
             return False
         
-        remaining = [c for c in player_cards if c not in move]
+        remaining = without_cards(player_cards, move)
         
         if len(remaining) == 0:
             return True
@@ -392,16 +526,15 @@ class DoudizhuAI:
         """
         danger = 0.0
         
-        card_counts = Counter(c.value for c in player_cards)
+        card_counts = count_vector(player_cards)
         
         potential_bomb_count = 0
-        for value, count in card_counts.items():
-            if value not in [CardValue.SMALL_JOKER, CardValue.BIG_JOKER]:
-                if value not in seen_cards:
-                    if count == 4:
-                        potential_bomb_count += 1
-                    elif count == 3:
-                        potential_bomb_count += 0.5
+        for index, count in enumerate(card_counts[:RANK_INDEX[CardValue.SMALL_JOKER]]):
+            if RANK_VALUES[index] not in seen_cards:
+                if count == 4:
+                    potential_bomb_count += 1
+                elif count == 3:
+                    potential_bomb_count += 0.5
         
         big_cards = [CardValue.TWO, CardValue.ACE, CardValue.KING, 
                     CardValue.QUEEN, CardValue.JACK]
@@ -485,7 +618,7 @@ class DoudizhuAI:
             return float('inf')
         
         play_type, play_value = DoudizhuAI._analyze_play(move)
-        remaining = [c for c in player_cards if c not in move]
+        remaining = without_cards(player_cards, move)
         
         if play_type == PlayType.SINGLE:
             if play_value.value <= 10:
@@ -620,12 +753,12 @@ class DoudizhuAI:
         Q₂ = (破坏重要组合数) × (-1.5)
         重要组合：炸弹、三张、顺子组件
         """
-        move_values = set(c.value for c in move)
-        remaining = [c for c in player_cards if c.value not in move_values]
-        remaining_counts = Counter(c.value for c in remaining)
+        remaining_counts = count_vector(player_cards)
+        for card in move:
+            remaining_counts[RANK_INDEX[card.value]] = 0
         
         destruction = 0
-        for value, count in remaining_counts.items():
+        for count in remaining_counts:
             if count >= 4:
                 destruction += 1
             elif count == 3:
@@ -764,172 +897,68 @@ class DoudizhuAI:
         for card in cards:
             moves.append([card])
         
-        for value in DoudizhuAI._get_repeated_values(cards, 2):
-            card_list = [c for c in cards if c.value == value]
-            if len(card_list) >= 2:
-                moves.append(card_list[:2])
+        # 牌值 -> 该牌值的卡牌（保持手牌顺序），代替每次线性扫描
+        by_rank = _group_by_rank(cards)
+        pair_value_set = DoudizhuAI._get_repeated_values(cards, 2)
+        
+        for value in pair_value_set:
+            moves.append(by_rank[RANK_INDEX[value]][:2])
         
         for value in DoudizhuAI._get_repeated_values(cards, 3):
-            card_list = [c for c in cards if c.value == value]
-            if len(card_list) >= 3:
-                moves.append(card_list[:3])
+            moves.append(by_rank[RANK_INDEX[value]][:3])
         
         for value in DoudizhuAI._get_repeated_values(cards, 4):
-            card_list = [c for c in cards if c.value == value]
-            if len(card_list) == 4:
-                moves.append(card_list)
+            moves.append(list(by_rank[RANK_INDEX[value]]))
         
         trio_values = list(DoudizhuAI._get_repeated_values(cards, 3))
         
         for value in trio_values:
-            trio_cards = [c for c in cards if c.value == value]
-            if len(trio_cards) >= 3:
-                remaining = [c for c in cards if c.value != value]
-                for single in remaining:
-                    moves.append(trio_cards[:3] + [single])
-                
-                pair_values = {v for v in DoudizhuAI._get_repeated_values(cards, 2) if v != value}
-                for pair_val in pair_values:
-                    pair_cards = [c for c in cards if c.value == pair_val]
-                    moves.append(trio_cards[:3] + pair_cards[:2])
+            trio_cards = by_rank[RANK_INDEX[value]][:3]
+            for single in cards:
+                if single.value != value:
+                    moves.append(trio_cards + [single])
+            
+            pair_values = {v for v in pair_value_set if v != value}
+            for pair_val in pair_values:
+                moves.append(trio_cards + by_rank[RANK_INDEX[pair_val]][:2])
         
         moves.extend(DoudizhuAI._get_straights(cards))
         moves.extend(DoudizhuAI._get_pair_straights(cards))
         moves.extend(DoudizhuAI._get_planes(cards))
         moves.extend(DoudizhuAI._get_plane_with_wings(cards))
         
-        has_small = any(c.value == CardValue.SMALL_JOKER for c in cards)
-        has_big = any(c.value == CardValue.BIG_JOKER for c in cards)
-        if has_small and has_big:
-            small = next(c for c in cards if c.value == CardValue.SMALL_JOKER)
-            big = next(c for c in cards if c.value == CardValue.BIG_JOKER)
-            moves.append([small, big])
+        small_jokers = by_rank[RANK_INDEX[CardValue.SMALL_JOKER]]
+        big_jokers = by_rank[RANK_INDEX[CardValue.BIG_JOKER]]
+        if small_jokers and big_jokers:
+            moves.append([small_jokers[0], big_jokers[0]])
         
         return moves
     
     @staticmethod
     def _get_repeated_values(cards: List[Card], count: int) -> set:
         """获取重复的卡牌值"""
-        value_counts = Counter(card.value for card in cards)
-        return {value for value, cnt in value_counts.items() if cnt >= count}
+        counts = count_vector(cards)
+        return {RANK_VALUES[i] for i, cnt in enumerate(counts) if cnt >= count}
     
     @staticmethod
     def _get_straights(cards: List[Card], min_length: int = 5) -> List[List[Card]]:
         """获取所有可能的单顺"""
-        sequences = []
-        valid_values = [v for v in CardValue 
-                       if v.value < CardValue.TWO.value 
-                       and v != CardValue.SMALL_JOKER 
-                       and v != CardValue.BIG_JOKER]
-        
-        sorted_cards = sorted([c for c in cards if c.value in valid_values], 
-                             key=lambda c: c.value.value)
-        
-        if len(sorted_cards) < min_length:
-            return sequences
-        
-        value_list = [c.value for c in sorted_cards]
-        unique_values = []
-        seen = set()
-        for v in value_list:
-            if v not in seen:
-                unique_values.append(v)
-                seen.add(v)
-        
-        n = len(unique_values)
-        for length in range(min_length, n + 1):
-            for start in range(0, n - length + 1):
-                straight_values = unique_values[start:start + length]
-                if all(unique_values[start + i].value == unique_values[start].value + i 
-                      for i in range(length)):
-                    card_list = []
-                    for v in straight_values:
-                        card = next(c for c in cards if c.value == v)
-                        card_list.append(card)
-                    sequences.append(card_list)
-        
-        return sequences
+        return _map_to_hand(cards, _straight_templates, min_length)
     
     @staticmethod
     def _get_pair_straights(cards: List[Card], min_pairs: int = 3) -> List[List[Card]]:
         """获取所有可能的双顺"""
-        sequences = []
-        pair_values = sorted(list(DoudizhuAI._get_repeated_values(cards, 2)), key=lambda v: v.value)
-        
-        if len(pair_values) < min_pairs:
-            return sequences
-        
-        n = len(pair_values)
-        for length in range(min_pairs, n + 1):
-            for start in range(0, n - length + 1):
-                straight_values = pair_values[start:start + length]
-                if all(pair_values[start + i].value == pair_values[start].value + i 
-                      for i in range(length)):
-                    card_list = []
-                    for v in straight_values:
-                        card = [c for c in cards if c.value == v][:2]
-                        card_list.extend(card)
-                    sequences.append(card_list)
-        
-        return sequences
+        return _map_to_hand(cards, _pair_straight_templates, min_pairs)
     
     @staticmethod
     def _get_planes(cards: List[Card], min_groups: int = 2) -> List[List[Card]]:
         """获取所有可能的飞机（纯飞机）"""
-        planes = []
-        trio_values = sorted(list(DoudizhuAI._get_repeated_values(cards, 3)), key=lambda v: v.value)
-        
-        if len(trio_values) < min_groups:
-            return planes
-        
-        n = len(trio_values)
-        for length in range(min_groups, n + 1):
-            for start in range(0, n - length + 1):
-                plane_values = trio_values[start:start + length]
-                if all(trio_values[start + i].value == trio_values[start].value + i 
-                      for i in range(length)):
-                    card_list = []
-                    for v in plane_values:
-                        card = [c for c in cards if c.value == v][:3]
-                        card_list.extend(card)
-                    planes.append(card_list)
-        
-        return planes
+        return _map_to_hand(cards, _plane_templates, min_groups)
     
     @staticmethod
     def _get_plane_with_wings(cards: List[Card]) -> List[List[Card]]:
         """获取所有可能的飞机带翅膀"""
-        planes = []
-        trio_values = sorted(list(DoudizhuAI._get_repeated_values(cards, 3)), key=lambda v: v.value)
-        
-        for trio_count in range(2, len(trio_values) + 1):
-            for start in range(0, len(trio_values) - trio_count + 1):
-                plane_values = trio_values[start:start + trio_count]
-                if all(trio_values[start + i].value == trio_values[start].value + i 
-                      for i in range(trio_count)):
-                    trio_cards = []
-                    for v in plane_values:
-                        card = [c for c in cards if c.value == v][:3]
-                        trio_cards.extend(card)
-                    
-                    remaining = [c for c in cards if c.value not in plane_values]
-                    
-                    single_count = trio_count
-                    if len(remaining) >= single_count:
-                        for singles in combinations(remaining, single_count):
-                            planes.append(list(trio_cards) + list(singles))
-                    
-                    pair_values = sorted([v for v in DoudizhuAI._get_repeated_values(cards, 2) 
-                                         if v not in plane_values], key=lambda v: v.value)
-                    if len(pair_values) >= trio_count and len(remaining) >= trio_count * 2:
-                        for i in range(len(pair_values) - trio_count + 1):
-                            selected_pairs = pair_values[i:i + trio_count]
-                            pair_cards = []
-                            for v in selected_pairs:
-                                pair_cards.extend([c for c in cards if c.value == v][:2])
-                            planes.append(list(trio_cards) + pair_cards)
-        
-        return planes
+        return _map_to_hand(cards, _plane_with_wings_templates)
     
     @staticmethod
     def is_valid_play(cards: List[Card], table_cards: List[Card]) -> bool:
@@ -940,18 +969,19 @@ class DoudizhuAI:
         if not table_cards:
             return True
         
-        play_type, play_value = DoudizhuAI._analyze_play(cards)
-        table_type, table_value = DoudizhuAI._analyze_play(table_cards)
+        # 用整数编号比较，不经过枚举
+        play_type, play_value = _play_code(bytes(count_vector(cards)))
+        table_type, table_value = _play_code(bytes(count_vector(table_cards)))
         
-        if play_type == PlayType.ROCKET:
+        if play_type == PT_ROCKET:
             return True
         
-        if table_type == PlayType.ROCKET:
+        if table_type == PT_ROCKET:
             return False
         
-        if play_type == PlayType.BOMB:
-            if table_type == PlayType.BOMB:
-                return play_value.value > table_value.value
+        if play_type == PT_BOMB:
+            if table_type == PT_BOMB:
+                return play_value > table_value
             return True
         
         if play_type != table_type:
@@ -960,7 +990,7 @@ class DoudizhuAI:
         if len(cards) != len(table_cards):
             return False
         
-        return play_value.value > table_value.value
+        return play_value > table_value
     
     @staticmethod
     def _analyze_play(cards: List[Card]) -> tuple:
@@ -968,90 +998,11 @@ class DoudizhuAI:
         if not cards:
             return PlayType.SINGLE, CardValue.THREE
         
-        if len(cards) == 1:
-            return PlayType.SINGLE, cards[0].value
-        
-        if len(cards) == 2:
-            if cards[0].value == cards[1].value:
-                return PlayType.PAIR, cards[0].value
-            
-            has_small = any(c.value == CardValue.SMALL_JOKER for c in cards)
-            has_big = any(c.value == CardValue.BIG_JOKER for c in cards)
-            if has_small and has_big:
-                return PlayType.ROCKET, CardValue.BIG_JOKER
-        
-        values = [c.value for c in cards]
-        value_counts = Counter(values)
-        
-        if len(cards) == 4 and 4 in value_counts.values():
-            return PlayType.BOMB, max(values, key=lambda v: v.value)
-        
-        if 3 in value_counts.values():
-            trio_value = [v for v, cnt in value_counts.items() if cnt >= 3][0]
-            trio_count = value_counts[trio_value]
-            
-            if len(cards) == 3:
-                return PlayType.TRIO, trio_value
-            
-            if len(cards) == 4 and trio_count + 1 == len(cards):
-                return PlayType.TRIO_SINGLE, trio_value
-            
-            if len(cards) == 5:
-                others = [cnt for k, cnt in value_counts.items() if k != trio_value]
-                if sorted(others) == [2]:
-                    return PlayType.TRIO_PAIR, trio_value
-                if sorted(others) == [1, 1]:
-                    return PlayType.TRIO_SINGLE, trio_value
-        
-        if 2 in value_counts.values() and len(cards) >= 6:
-            pair_values = sorted([v for v, cnt in value_counts.items() if cnt >= 2], 
-                                key=lambda v: v.value)
-            is_straight = all(pair_values[i].value == pair_values[0].value + i 
-                            for i in range(len(pair_values)))
-            if is_straight and len(pair_values) >= 3:
-                if len(pair_values) * 2 == len(cards):
-                    return PlayType.PAIR_STRAIGHT, pair_values[-1]
-        
-        single_vals = sorted([v for v in values if value_counts[v] == 1], 
-                            key=lambda v: v.value)
-        if len(single_vals) >= 5 and len(single_vals) == len(cards):
-            is_straight = all(single_vals[i].value == single_vals[0].value + i 
-                            for i in range(len(single_vals)))
-            if is_straight:
-                return PlayType.STRAIGHT, single_vals[-1]
-        
-        if 3 in value_counts.values():
-            trio_values = sorted([v for v, cnt in value_counts.items() if cnt >= 3], 
-                                key=lambda v: v.value)
-            is_plane = all(trio_values[i].value == trio_values[0].value + i 
-                          for i in range(len(trio_values)))
-            
-            if is_plane:
-                wing_count = len(cards) - len(trio_values) * 3
-                if wing_count == 0:
-                    return PlayType.PLANE, trio_values[-1]
-                
-                if wing_count == len(trio_values):
-                    wing_values = sorted([v for v in values if value_counts[v] == 1], 
-                                        key=lambda v: v.value)
-                    if len(wing_values) == wing_count:
-                        return PlayType.PLANE_SINGLE, trio_values[-1]
-                
-                if wing_count == len(trio_values) * 2:
-                    pair_wing_values = sorted([v for v in value_counts.items() if v[1] >= 2], 
-                                             key=lambda x: x[0].value)
-                    if len(pair_wing_values) == len(trio_values):
-                        return PlayType.PLANE_PAIR, trio_values[-1]
-        
-        if len(cards) == 6 and 4 in value_counts.values():
-            return PlayType.FOUR_WITH_TWO, max(values, key=lambda v: v.value)
-        
-        return PlayType.SINGLE, max(values, key=lambda v: v.value)
+        return _analyze_counts(bytes(count_vector(cards)))
     
     @staticmethod
     def _play_smallest_card(cards: List[Card]) -> List[Card]:
         """出最小的牌"""
         if not cards:
             return []
-        sorted_cards = sorted(cards, key=lambda c: (c.value.value, c.suit.value if c.suit else 0))
-        return [sorted_cards[0]]
+        return [min(cards, key=attrgetter('sort_key'))]
@@ -3,16 +3,22 @@
 完整版本，包含AI玩家、卡牌系统、游戏逻辑、鼠标选牌
 """
 import ctypes
+import math
 import pygame
 import sys
 import random
 import os
+from bisect import insort
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import List, Tuple, Optional, Set, Dict
+from typing import List, Tuple, Optional, Dict, Sequence
 from dataclasses import dataclass
-from collections import Counter
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from operator import attrgetter
 
-from shared_types import Card, CardValue, Suit, PlayType
+from shared_types import (Card, CardValue, Suit, PlayType, RANK_INDEX, count_vector, hand_mask, PT_NONE, PT_BOMB, PT_ROCKET,
+                          STRAIGHT_MASK, bit_indices, find_sequences)
 from ai_player import DoudizhuAI
 
 # 初始化Pygame
@@ -30,6 +36,7 @@ except AttributeError:
 WINDOW_WIDTH = 2000
 WINDOW_HEIGHT = 1400
 FPS = 60
+AI_MOVE_DELAY = 2000  # AI 出牌前的停顿（毫秒），让游戏看起来更自然
 CARD_WIDTH = 200  # 增大卡牌宽度以显示更清晰的图片
 CARD_HEIGHT = 300  # 增大卡牌高度
 CARD_OVERLAP = int(CARD_WIDTH * 2/5)  # 叠放的重叠距离（1/3宽度，使每张牌露出2/3）
@@ -38,6 +45,24 @@ TEXT_COLOR = (255, 255, 255)  # 白色文字
 BUTTON_COLOR = (70, 70, 70)
 BUTTON_HOVER_COLOR = (100, 100, 100)
 BUTTON_PRESS_COLOR = (50, 50, 50)
+DEBUG = False  # 打开后输出出牌和绘制过程的调试信息
+
+
+def _dbg(msg: str, *args):
+    """调试输出；参数按 % 格式惰性拼接，DEBUG 关闭时不做任何格式化"""
+    if DEBUG:
+        print(msg % args if args else msg)
+
+
+# 完整的54张牌，模块加载时只构造一次，每副新牌直接复制（卡牌创建后不会被修改）
+_FULL_DECK_TEMPLATE: Tuple[Card, ...] = tuple(
+    Card(suit, value)
+    for suit in Suit
+    for value in (CardValue.THREE, CardValue.FOUR, CardValue.FIVE,
+                  CardValue.SIX, CardValue.SEVEN, CardValue.EIGHT,
+                  CardValue.NINE, CardValue.TEN, CardValue.JACK,
+                  CardValue.QUEEN, CardValue.KING, CardValue.ACE, CardValue.TWO)
+) + (Card(None, CardValue.SMALL_JOKER), Card(None, CardValue.BIG_JOKER))
 
 class Deck:
     """牌堆类"""
@@ -46,17 +71,7 @@ class Deck:
         self._initialize_deck()
     def _initialize_deck(self):
         """初始化牌堆（54张牌）"""
-        self.cards = []
-        # 添加普通牌（3-A，4种花色）
-        for suit in Suit:
-            for value in [CardValue.THREE, CardValue.FOUR, CardValue.FIVE,
-                         CardValue.SIX, CardValue.SEVEN, CardValue.EIGHT,
-                         CardValue.NINE, CardValue.TEN, CardValue.JACK,
-                         CardValue.QUEEN, CardValue.KING, CardValue.ACE, CardValue.TWO]:
-                self.cards.append(Card(suit, value))
-        # 添加王牌
-        self.cards.append(Card(None, CardValue.SMALL_JOKER))
-        self.cards.append(Card(None, CardValue.BIG_JOKER))
+        self.cards = list(_FULL_DECK_TEMPLATE)
     
     def shuffle(self):
         """洗牌"""
@@ -64,7 +79,20 @@ class Deck:
     
     def deal(self, num: int) -> List[Card]:
         """发牌"""
-        return [self.cards.pop() for _ in range(num)]
+        if num <= 0:
+            return []
+        dealt = self.cards[-num:]
+        del self.cards[-num:]
+        return dealt
+    
+    def deal_all_three(self, num: int = 17) -> Tuple[List[Card], List[Card], List[Card]]:
+        """一次性给三名玩家各发 num 张牌"""
+        start = len(self.cards) - num * 3
+        hands = (self.cards[start:start + num],
+                 self.cards[start + num:start + num * 2],
+                 self.cards[start + num * 2:])
+        del self.cards[start:]
+        return hands
 
 class GamePhase(Enum):
     """游戏阶段"""
@@ -72,13 +100,279 @@ class GamePhase(Enum):
     PLAYING = 2          # 出牌阶段
     GAME_OVER = 3        # 游戏结束
 
+# 出牌模板：((牌值下标, 该牌值中的第几张), ...)，只依赖各牌值张数
+MoveTemplate = Tuple[Tuple[int, int], ...]
+
+
+# 张数阈值掩码：masks[k] 为张数≥k 的牌值位掩码（k=1..4，第 i 位对应下标 i，masks[0] 恒为0）
+CountMasks = Sequence[int]
+
+def _count_masks(counts: bytes) -> Tuple[int, int, int, int, int]:
+    """一次遍历计数向量，得到全部张数阈值掩码"""
+    masks = [0, 0, 0, 0, 0]
+    for index, cnt in enumerate(counts):
+        bit = 1 << index
+        for k in range(1, cnt + 1):
+            masks[k] |= bit
+    return tuple(masks)
+
+
+def _take(index: int, count: int) -> MoveTemplate:
+    """某牌值的前 count 张"""
+    return tuple((index, nth) for nth in range(count))
+
+
+def _straight_templates(masks: CountMasks, min_length: int = 5) -> List[MoveTemplate]:
+    """所有可能的单顺"""
+    return [tuple((index, 0) for index in range(start, start + length))
+            for length, start in find_sequences(masks[1] & STRAIGHT_MASK, min_length)]
+
+
+def _pair_straight_templates(masks: CountMasks, min_pairs: int = 3) -> List[MoveTemplate]:
+    """所有可能的双顺"""
+    return [sum((_take(index, 2) for index in range(start, start + length)), ())
+            for length, start in find_sequences(masks[2], min_pairs)]
+
+
+def _plane_templates(masks: CountMasks, min_groups: int = 2) -> List[MoveTemplate]:
+    """所有可能的飞机（纯飞机）"""
+    return [sum((_take(index, 3) for index in range(start, start + length)), ())
+            for length, start in find_sequences(masks[3], min_groups)]
+
+
+def _plane_with_wings_templates(masks: CountMasks) -> List[MoveTemplate]:
+    """所有可能的飞机带翅膀"""
+    planes = []
+    seen = set()
+    
+    for trio_count, start in find_sequences(masks[3], 2):
+        plane_mask = ((1 << trio_count) - 1) << start
+        trio_cards = sum((_take(index, 3) for index in range(start, start + trio_count)), ())
+        
+        # 单翅膀从飞机以外的剩余牌中任取 trio_count 张（同一牌值可取多张，如 333444+55）；
+        # 按牌值可重组合枚举，每种取牌方式只出现一次，避免同值不同花色的重复出牌
+        singles_pool = bit_indices(masks[1] & ~plane_mask)
+        remaining_count = sum((mask & ~plane_mask).bit_count() for mask in masks)
+        
+        for singles in combinations_with_replacement(singles_pool, trio_count):
+            move = trio_cards
+            for index in dict.fromkeys(singles):
+                taken = singles.count(index)
+                if taken >= len(masks) or not masks[taken] >> index & 1:
+                    break
+                move += _take(index, taken)
+            else:
+                if move not in seen:
+                    seen.add(move)
+                    planes.append(move)
+        
+        wing_indices = bit_indices(masks[2] & ~plane_mask)
+        if len(wing_indices) >= trio_count and remaining_count >= trio_count * 2:
+            for i in range(len(wing_indices) - trio_count + 1):
+                selected_pairs = wing_indices[i:i + trio_count]
+                move = trio_cards + sum((_take(index, 2) for index in selected_pairs), ())
+                if move not in seen:
+                    seen.add(move)
+                    planes.append(move)
+    
+    return planes
+
+
+@lru_cache(maxsize=200000)
+def _enumerate_moves(sig: bytes) -> Tuple[MoveTemplate, ...]:
+    """按手牌的计数签名枚举所有出牌方式
+    
+    出牌是否合法与花色无关，因此同一签名的手牌共享同一份出牌模板。
+    """
+    moves = [()]
+    masks = _count_masks(sig)
+    
+    for index, cnt in enumerate(sig):
+        for nth in range(cnt):
+            moves.append(((index, nth),))
+    
+    pair_indices = bit_indices(masks[2])
+    trio_indices = bit_indices(masks[3])
+    
+    for index in pair_indices:
+        moves.append(_take(index, 2))
+    
+    for index in trio_indices:
+        moves.append(_take(index, 3))
+    
+    for index in bit_indices(masks[4]):
+        moves.append(_take(index, 4))
+    
+    for index in trio_indices:
+        trio_cards = _take(index, 3)
+        for single_index, cnt in enumerate(sig):
+            if single_index != index:
+                for nth in range(cnt):
+                    moves.append(trio_cards + ((single_index, nth),))
+        
+        for pair_index in pair_indices:
+            if pair_index != index:
+                moves.append(trio_cards + _take(pair_index, 2))
+    
+    moves.extend(_straight_templates(masks))
+    moves.extend(_pair_straight_templates(masks))
+    moves.extend(_plane_templates(masks))
+    moves.extend(_plane_with_wings_templates(masks))
+    
+    small_index = RANK_INDEX[CardValue.SMALL_JOKER]
+    big_index = RANK_INDEX[CardValue.BIG_JOKER]
+    if sig[small_index] and sig[big_index]:
+        moves.append(((small_index, 0), (big_index, 0)))
+    
+    return tuple(moves)
+
+
+# ---- 牌型识别：按 (张数, 各牌值张数降序) 分派 ----
+_TWO_INDEX = RANK_INDEX[CardValue.TWO]
+
+
+def _cls_single(counts: List[int]):
+    return PlayType.SINGLE, counts.index(1) + 3
+
+
+def _cls_pair(counts: List[int]):
+    return PlayType.PAIR, counts.index(2) + 3
+
+
+def _cls_rocket(counts: List[int]):
+    if counts[RANK_INDEX[CardValue.SMALL_JOKER]] and counts[RANK_INDEX[CardValue.BIG_JOKER]]:
+        return PlayType.ROCKET, CardValue.BIG_JOKER.value
+    return None
+
+
+def _cls_trio(counts: List[int]):
+    return PlayType.TRIO, counts.index(3) + 3
+
+
+def _cls_bomb(counts: List[int]):
+    return PlayType.BOMB, counts.index(4) + 3
+
+
+def _cls_trio_single(counts: List[int]):
+    return PlayType.TRIO_SINGLE, counts.index(3) + 3
+
+
+def _cls_trio_pair(counts: List[int]):
+    return PlayType.TRIO_PAIR, counts.index(3) + 3
+
+
+def _cls_four_with_two(counts: List[int]):
+    return PlayType.FOUR_WITH_TWO, counts.index(4) + 3
+
+
+_CLASSIFY_DISPATCH = {
+    (1, (1,)): _cls_single,
+    (2, (2,)): _cls_pair,
+    (2, (1, 1)): _cls_rocket,
+    (3, (3,)): _cls_trio,
+    (4, (4,)): _cls_bomb,
+    (4, (3, 1)): _cls_trio_single,
+    (5, (3, 2)): _cls_trio_pair,
+    (5, (3, 1, 1)): _cls_trio_single,  # 沿用原规则：3+1+1 也按三带一处理
+    (6, (4, 1, 1)): _cls_four_with_two,
+    (8, (4, 2, 2)): _cls_four_with_two,
+}
+
+
+def _classify_sequence(counts: List[int], length: int, shape: Tuple[int, ...]):
+    """顺子、双顺、飞机（可带翅膀）的识别，均不能包含2或王"""
+    if shape[0] == 1:
+        # 单顺：5张或以上，牌值连续
+        if length >= 5:
+            mask = _count_masks(counts)[1]
+            low = (mask & -mask).bit_length() - 1
+            if mask == ((1 << length) - 1) << low and mask < (1 << _TWO_INDEX):
+                return PlayType.STRAIGHT, low + length - 1 + 3
+        return None
+    
+    if shape[0] == 2 and shape[-1] == 2:
+        # 双顺：3对或以上连续对子
+        pairs = length // 2
+        if pairs >= 3:
+            mask = _count_masks(counts)[2]
+            low = (mask & -mask).bit_length() - 1
+            if mask == ((1 << pairs) - 1) << low and mask < (1 << _TWO_INDEX):
+                return PlayType.PAIR_STRAIGHT, low + pairs - 1 + 3
+        return None
+    
+    if shape[0] < 3:
+        return None
+    
+    # 飞机：按组数从小到大、起点从低到高找第一个满足张数的连续三张段
+    masks = _count_masks(counts)
+    pair_mask = masks[2]
+    for run_len, start in find_sequences(masks[3] & STRAIGHT_MASK, 2):
+        base_cards = run_len * 3
+        top = start + run_len - 1 + 3
+        if length == base_cards:
+            return PlayType.PLANE, top
+        if length == base_cards + run_len:
+            return PlayType.PLANE_SINGLE, top
+        if length == base_cards + run_len * 2:
+            run_mask = ((1 << run_len) - 1) << start
+            if (pair_mask & ~run_mask).bit_count() >= run_len:
+                return PlayType.PLANE_PAIR, top
+    return None
+
+
+def _classify_counts(counts: List[int], length: int) -> Tuple[Optional[PlayType], Optional[int]]:
+    """按计数向量识别牌型，返回 (牌型, 比较值)"""
+    shape = tuple(sorted((cnt for cnt in counts if cnt), reverse=True))
+    
+    handler = _CLASSIFY_DISPATCH.get((length, shape))
+    result = handler(counts) if handler else None
+    if result is None:
+        result = _classify_sequence(counts, length, shape)
+    return result if result else (None, None)
+
+
+def _compare_plays(type1: int, key1: int, len1: int,
+                   type2: int, key2: int, len2: int) -> int:
+    """比较两手已识别的牌（牌型为 PT_* 整数编号），返回 1=赢, -1=输, 0=无效比较
+
+    只做整数比较，不构造任何中间对象。
+    """
+    # 如果任一手牌不是合法牌型
+    if type1 == PT_NONE or type2 == PT_NONE:
+        return 0
+    
+    # 同牌型：张数必须相等（顺子/连对/飞机/四带二的长度也由此保证），再比较主段点数
+    if type1 == type2:
+        if len1 != len2:
+            return 0
+        return (key1 > key2) - (key1 < key2)
+    
+    # 不同牌型：火箭最大，炸弹压制除火箭外的任何牌型，其他不能相互比较
+    if type1 == PT_ROCKET:
+        return 1
+    if type2 == PT_ROCKET:
+        return -1
+    if type1 == PT_BOMB:
+        return 1
+    if type2 == PT_BOMB:
+        return -1
+    return 0
+
+
 class Player:
     """玩家类"""
+    __slots__ = ("id", "name", "is_ai", "cards", "counts", "masks", "cards_by_value", "hand_mask",
+                 "is_landlord", "is_active", "last_played_cards")
+    
     def __init__(self, player_id: int, name: str, is_ai: bool = False):
         self.id = player_id
         self.name = name
         self.is_ai = is_ai
         self.cards: List[Card] = []
+        self.counts = bytearray(15)  # 各牌值的张数（下标见 RANK_INDEX）
+        self.masks = [0, 0, 0, 0, 0]  # 张数阈值掩码，随增删牌增量维护
+        self.cards_by_value: Dict[int, List[Card]] = {index: [] for index in range(15)}
+        self.hand_mask = 0  # 手牌位掩码（第 card.bit 位表示持有该牌）
         self.is_landlord = False
         self.is_active = True  # 是否还在游戏中
         self.last_played_cards: List[Card] = []  # 最后出的牌
@@ -86,206 +380,93 @@ class Player:
     def add_cards(self, cards: List[Card]):
         """添加卡牌"""
         self.cards.extend(cards)
+        for card in cards:
+            index = RANK_INDEX[card.value]
+            self.counts[index] += 1
+            self.masks[self.counts[index]] |= 1 << index
+            self.hand_mask |= 1 << card.bit
         self.sort_cards()
     
     def sort_cards(self):
         """对卡牌进行排序"""
-        self.cards.sort(key=lambda c: (c.value.value, c.suit.value if c.suit else 0))
+        self.cards.sort(key=attrgetter('sort_key'))
+        # 按排序后的顺序重建牌值索引
+        self.cards_by_value = {index: [] for index in range(15)}
+        for card in self.cards:
+            self.cards_by_value[RANK_INDEX[card.value]].append(card)
     
     def remove_cards(self, cards: List[Card]) -> bool:
-        """移除卡牌"""
+        """移除卡牌（先确认全部在手牌中，再一次性移除）"""
+        mask = hand_mask(cards)
+        # 有牌不在手中，或同一张牌出现两次，都不能移除
+        if mask & ~self.hand_mask or mask.bit_count() != len(cards):
+            return False
+        
+        self.hand_mask ^= mask
         for card in cards:
-            if card in self.cards:
-                self.cards.remove(card)
-            else:
-                return False
+            index = RANK_INDEX[card.value]
+            self.masks[self.counts[index]] &= ~(1 << index)
+            self.counts[index] -= 1
+            self.cards_by_value[index].remove(card)
+        # 牌值索引本身有序，按它重建手牌即可保持排序
+        self.cards = [card for index in range(15) for card in self.cards_by_value[index]]
         return True
     
     def can_play(self, cards: List[Card]) -> bool:
         """检查是否能出牌"""
         if not cards:
             return True  # 不出牌总是可以的
-        return all(card in self.cards for card in cards)
+        return not hand_mask(cards) & ~self.hand_mask
     
     def get_all_playable_moves(self) -> List[List[Card]]:
         """获取所有可能的出牌方式"""
-        moves = []
-        
         if not self.cards:
             return [[]]
         
-        moves.append([])
-        
-        for card in self.cards:
-            moves.append([card])
-        
-        for value in self._get_repeated_values(2):
-            cards = [c for c in self.cards if c.value == value]
-            if len(cards) >= 2:
-                moves.append(cards[:2])
-        
-        for value in self._get_repeated_values(3):
-            cards = [c for c in self.cards if c.value == value]
-            if len(cards) >= 3:
-                moves.append(cards[:3])
-        
-        for value in self._get_repeated_values(4):
-            cards = [c for c in self.cards if c.value == value]
-            if len(cards) == 4:
-                moves.append(cards)
-        
-        trio_values = list(self._get_repeated_values(3))
-        
-        for value in trio_values:
-            trio_cards = [c for c in self.cards if c.value == value]
-            if len(trio_cards) >= 3:
-                remaining = [c for c in self.cards if c.value != value]
-                for single in remaining:
-                    moves.append(trio_cards[:3] + [single])
-                
-                pair_values = {v for v in self._get_repeated_values(2) if v != value}
-                for pair_val in pair_values:
-                    pair_cards = [c for c in self.cards if c.value == pair_val]
-                    moves.append(trio_cards[:3] + pair_cards[:2])
-        
-        moves.extend(self._get_straights())
-        moves.extend(self._get_pair_straights())
-        moves.extend(self._get_planes())
-        moves.extend(self._get_plane_with_wings())
-        
-        has_small = any(c.value == CardValue.SMALL_JOKER for c in self.cards)
-        has_big = any(c.value == CardValue.BIG_JOKER for c in self.cards)
-        if has_small and has_big:
-            small = next(c for c in self.cards if c.value == CardValue.SMALL_JOKER)
-            big = next(c for c in self.cards if c.value == CardValue.BIG_JOKER)
-            moves.append([small, big])
-        
-        return moves
-    
-    def _get_repeated_values(self, count: int) -> Set[CardValue]:
-        """获取重复的卡牌值"""
-        value_counts = Counter(card.value for card in self.cards)
-        return {value for value, cnt in value_counts.items() if cnt >= count}
+        return [self._hydrate(move) for move in _enumerate_moves(bytes(self.counts))]
+    
+    def _hydrate(self, template: MoveTemplate) -> List[Card]:
+        """把出牌模板映射为手牌中的具体卡牌"""
+        return [self.cards_by_value[index][nth] for index, nth in template]
     
     def _get_straights(self, min_length: int = 5) -> List[List[Card]]:
         """获取所有可能的单顺"""
-        sequences = []
-        value_counts = Counter(card.value for card in self.cards)
-        
-        valid_values = [v for v in CardValue 
-                       if v.value < CardValue.TWO.value 
-                       and v != CardValue.SMALL_JOKER 
-                       and v != CardValue.BIG_JOKER]
-        
-        sorted_values = sorted([v for v in self.cards if v.value in valid_values], 
-                              key=lambda c: c.value.value)
-        
-        if len(sorted_values) < min_length:
-            return sequences
-        
-        value_list = [c.value for c in sorted_values]
-        unique_values = []
-        seen = set()
-        for v in value_list:
-            if v not in seen:
-                unique_values.append(v)
-                seen.add(v)
-        
-        n = len(unique_values)
-        for length in range(min_length, n + 1):
-            for start in range(0, n - length + 1):
-                straight_values = unique_values[start:start + length]
-                if all(unique_values[start + i].value == unique_values[start].value + i 
-                      for i in range(length)):
-                    cards = []
-                    for v in straight_values:
-                        card = next(c for c in self.cards if c.value == v)
-                        cards.append(card)
-                    sequences.append(cards)
-        
-        return sequences
+        return [self._hydrate(move) for move in _straight_templates(self.masks, min_length)]
     
     def _get_pair_straights(self, min_pairs: int = 3) -> List[List[Card]]:
         """获取所有可能的双顺"""
-        sequences = []
-        pair_values = sorted(list(self._get_repeated_values(2)), key=lambda v: v.value)
-        
-        if len(pair_values) < min_pairs:
-            return sequences
-        
-        n = len(pair_values)
-        for length in range(min_pairs, n + 1):
-            for start in range(0, n - length + 1):
-                straight_values = pair_values[start:start + length]
-                if all(pair_values[start + i].value == pair_values[start].value + i 
-                      for i in range(length)):
-                    cards = []
-                    for v in straight_values:
-                        card = [c for c in self.cards if c.value == v][:2]
-                        cards.extend(card)
-                    sequences.append(cards)
-        
-        return sequences
+        return [self._hydrate(move) for move in _pair_straight_templates(self.masks, min_pairs)]
     
     def _get_planes(self, min_groups: int = 2) -> List[List[Card]]:
         """获取所有可能的飞机（纯飞机）"""
-        planes = []
-        trio_values = sorted(list(self._get_repeated_values(3)), key=lambda v: v.value)
-        
-        if len(trio_values) < min_groups:
-            return planes
-        
-        n = len(trio_values)
-        for length in range(min_groups, n + 1):
-            for start in range(0, n - length + 1):
-                plane_values = trio_values[start:start + length]
-                if all(trio_values[start + i].value == trio_values[start].value + i 
-                      for i in range(length)):
-                    cards = []
-                    for v in plane_values:
-                        card = [c for c in self.cards if c.value == v][:3]
-                        cards.extend(card)
-                    planes.append(cards)
-        
-        return planes
+        return [self._hydrate(move) for move in _plane_templates(self.masks, min_groups)]
     
     def _get_plane_with_wings(self) -> List[List[Card]]:
         """获取所有可能的飞机带翅膀"""
-        planes = []
-        trio_values = sorted(list(self._get_repeated_values(3)), key=lambda v: v.value)
-        
-        for trio_count in range(2, len(trio_values) + 1):
-            for start in range(0, len(trio_values) - trio_count + 1):
-                plane_values = trio_values[start:start + trio_count]
-                if all(trio_values[start + i].value == trio_values[start].value + i 
-                      for i in range(trio_count)):
-                    trio_cards = []
-                    for v in plane_values:
-                        card = [c for c in self.cards if c.value == v][:3]
-                        trio_cards.extend(card)
-                    
-                    remaining = [c for c in self.cards if c.value not in plane_values]
-                    
-                    single_count = trio_count
-                    if len(remaining) >= single_count:
-                        from itertools import combinations
-                        for singles in combinations(remaining, single_count):
-                            planes.append(list(trio_cards) + list(singles))
-                    
-                    pair_values = sorted([v for v in self._get_repeated_values(2) 
-                                         if v not in plane_values], key=lambda v: v.value)
-                    if len(pair_values) >= trio_count and len(remaining) >= trio_count * 2:
-                        for i in range(len(pair_values) - trio_count + 1):
-                            selected_pairs = pair_values[i:i + trio_count]
-                            pair_cards = []
-                            for v in selected_pairs:
-                                pair_cards.extend([c for c in self.cards if c.value == v][:2])
-                            planes.append(list(trio_cards) + pair_cards)
-        
-        return planes
+        return [self._hydrate(move) for move in _plane_with_wings_templates(self.masks)]
 
 class DoudizhuGame:
     """斗地主游戏主类"""
+    __slots__ = (
+        # 窗口与字体
+        "screen", "clock", "font_large", "font_medium", "font_small",
+        "_font_path", "_font_cache", "_card_text_cache", "_card_face_cache", "_table_font", "_pass_text_surf",
+        # 牌局状态
+        "players", "deck", "phase", "current_player_id", "last_player_id", "trump_cards", "table_cards",
+        "_last_play_ref", "_last_play_info", "player_table_cards", "player_passed", "table_origin_center",
+        "pass_count", "selected_cards",
+        # 提示信息与按钮
+        "game_message", "_message_surf", "_message_rect", "_message_until",
+        "play_button", "skip_button", "restart_button", "button_hover",
+        # 图片与绘制缓存
+        "card_images", "card_images_gray", "avatar_images", "bg_image", "_bg_ready", "_card_bg", "_card_border",
+        "_hand_surface", "_hand_surface_dirty", "_hand_card_y", "_hand_layout_version", "_hand_xs",
+        "_avatar_blits", "_avatar_centers",
+        "_dirty", "_last_dirty", "_flipped_phase", "_needs_redraw",
+        # AI 调度
+        "_ai_executor", "_ai_move_at", "_ai_future",
+    )
+    
     def __init__(self):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("斗地主 - Pygame")
@@ -327,6 +508,15 @@ class DoudizhuGame:
             self.font_small = pygame.font.Font(None, 24)
             print("✓ 已加载默认字体")
         
+        # 牌面文字字体按字号缓存，字体文件是否存在只检查一次
+        self._font_path = font_path if os.path.exists(font_path) else None
+        self._font_cache: Dict[int, pygame.font.Font] = {}
+        self._card_text_cache: Dict[Tuple[Optional[Suit], CardValue], List[Tuple[pygame.Surface, Tuple[int, int]]]] = {}
+        self._card_face_cache: Dict[Tuple[Card, bool], pygame.Surface] = {}  # (卡牌, 是否选中) -> 完整牌面
+        # 桌面提示字体；SysFont 每次都要查找系统字体，只在这里创建一次
+        self._table_font = pygame.font.SysFont('SimHei', 28, bold=True)
+        self._pass_text_surf = self._table_font.render("跳过", True, (150, 150, 150))
+        
         self.players: List[Player] = []
         self.deck = None
         self.phase = GamePhase.DEALING
@@ -334,13 +524,17 @@ class DoudizhuGame:
         self.last_player_id = -1
         self.trump_cards: List[Card] = []
         self.table_cards: List[Card] = []  # 桌面上的牌（保留用于兼容性）
+        self._last_play_ref: Optional[List[Card]] = None  # 已缓存牌型信息的桌面牌
+        self._last_play_info: Optional[Tuple[int, int, int]] = None  # (牌型编号, 比较值, 张数)
         self.player_table_cards: Dict[int, List[Card]] = {}  # 每个玩家出的牌 {玩家ID: [牌列表]}
         self.player_passed: Dict[int, bool] = {}  # 记录每个玩家是否跳过 {玩家ID: 是否跳过}
         self.table_origin_center = True  # 本次桌面牌是否应居中显示（新一轮或清空时）
         self.pass_count = 0  # 连续不出牌的玩家数
-        self.selected_cards: Set[int] = set()  # 选中的卡牌索引
+        self.selected_cards: List[int] = []  # 选中的卡牌索引（保持升序）
         self.game_message = ""  # 游戏信息提示
-        self.message_timer = 0  # 信息显示计时器
+        self._message_surf: Optional[pygame.Surface] = None  # 渲染好的提示文字，显示期间不再重复渲染
+        self._message_rect: Optional[pygame.Rect] = None
+        self._message_until = 0  # 提示消失的时间点（pygame ticks），0 表示没有提示
         
         # 按钮
         self.play_button = pygame.Rect(WINDOW_WIDTH - 200, WINDOW_HEIGHT - 100, 90, 50)
@@ -350,6 +544,7 @@ class DoudizhuGame:
         
         # 加载自定义卡牌图片
         self.card_images: Dict[str, pygame.Surface] = {}
+        self.card_images_gray: Dict[str, pygame.Surface] = {}  # 灰度版本，首次使用时生成
         self._load_card_images()
         # 玩家头像字典
         self.avatar_images: Dict[int, pygame.Surface] = {}
@@ -358,6 +553,40 @@ class DoudizhuGame:
         # 加载背景图片
         self.bg_image = None
         self._load_bg_image()
+        # 底色上叠加背景图（逐像素透明度再乘 50% 整体透明度），预先合成为一张不透明表面，
+        # 结果与每帧先填底色再混合背景图完全一致，每帧只需一次整屏复制
+        self._bg_ready = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        self._bg_ready.fill(BG_COLOR)
+        if self.bg_image:
+            self._bg_ready.blit(self.bg_image, (0, 0))
+        
+        # 卡牌底色与边框做成表面，整手牌可以一次 blits 提交
+        self._card_bg: Dict[bool, pygame.Surface] = {}
+        for highlighted, color in ((False, (255, 255, 255)), (True, (200, 200, 100))):
+            bg = pygame.Surface((CARD_WIDTH, CARD_HEIGHT)).convert()
+            bg.fill(color)
+            self._card_bg[highlighted] = bg
+        self._card_border = pygame.Surface((CARD_WIDTH, CARD_HEIGHT), pygame.SRCALPHA)
+        pygame.draw.rect(self._card_border, (0, 0, 0), (0, 0, CARD_WIDTH, CARD_HEIGHT), 2)
+        
+        # 玩家手牌整条预先合成，只在手牌或选中状态变化时重绘
+        self._hand_surface: Optional[pygame.Surface] = None
+        self._hand_surface_dirty = True
+        # 手牌每张牌的横坐标，只在手牌张数变化时重算
+        self._hand_card_y = WINDOW_HEIGHT - CARD_HEIGHT - 70
+        self._hand_layout_version = -1  # 上次计算布局时的手牌张数
+        self._hand_xs: List[int] = []
+        
+        # 脏矩形：本帧和上一帧绘制过的区域，只把这些区域提交到屏幕
+        self._dirty: List[pygame.Rect] = []
+        self._last_dirty: List[pygame.Rect] = []
+        self._flipped_phase = None  # 上次整屏刷新时的阶段，阶段切换时整屏刷新
+        self._needs_redraw = True  # 画面状态是否有变化，没有变化的帧跳过绘制
+        
+        # AI 在后台线程中思考，与出牌前的停顿重叠进行
+        self._ai_executor = ThreadPoolExecutor(max_workers=1)
+        self._ai_move_at: Optional[int] = None  # 本次 AI 出牌的时间点（pygame ticks）
+        self._ai_future = None  # 正在计算的 AI 出牌
         
         self._init_game()
     
@@ -365,13 +594,17 @@ class DoudizhuGame:
         """初始化游戏"""
         # 桌面状态清空
         self.table_cards = []
+        self._last_play_ref = None
+        self._last_play_info = None
         self.player_table_cards = {}
         self.player_passed = {}
         self.pass_count = 0
         self.last_player_id = -1
-        self.selected_cards = set()
+        self.selected_cards = []
+        self._hand_surface_dirty = True
         self.game_message = ""
-        self.message_timer = 0
+        self._message_surf = None
+        self._message_until = 0
         
         # 创建玩家
         self.players = [
@@ -379,14 +612,15 @@ class DoudizhuGame:
             Player(1, "二階堂ヒロ", is_ai=True),
             Player(2, "桜羽エマ", is_ai=True),
         ]
+        self._build_avatar_blits()
         
         # 发牌
         self.deck = Deck()
         self.deck.shuffle()
         
         # 每个玩家发17张牌
-        for player in self.players:
-            player.add_cards(self.deck.deal(17))
+        for player, hand in zip(self.players, self.deck.deal_all_three(17)):
+            player.add_cards(hand)
         
         # 剩余的3张牌作为地主的底牌
         self.trump_cards = self.deck.deal(3)
@@ -398,6 +632,10 @@ class DoudizhuGame:
         self.current_player_id = landlord_id
         self.show_message(f"{self.players[landlord_id].name}是地主！", 120)
         self.phase = GamePhase.PLAYING
+        self._ai_move_at = None
+        self._ai_future = None
+        self._flipped_phase = None
+        self._needs_redraw = True
     
     def _load_card_images(self):
         """加载自定义卡牌图片"""
@@ -432,7 +670,8 @@ class DoudizhuGame:
                 file_path = os.path.join(card_images_dir, f"{value_name}{ext}")
                 if os.path.exists(file_path):
                     try:
-                        img = pygame.image.load(file_path)
+                        # 转换为显示格式，避免每次绘制时逐像素转换
+                        img = pygame.image.load(file_path).convert_alpha()
                         # 等比例缩放，只限制宽度填充牌面宽度
                         img = self._scale_image_proportionally(img, CARD_WIDTH, None)
                         self.card_images[value.name] = img
@@ -458,7 +697,7 @@ class DoudizhuGame:
                 file_path = os.path.join(avatar_dir, f"avatar{i}{ext}")
                 if os.path.exists(file_path):
                     try:
-                        img = pygame.image.load(file_path)
+                        img = pygame.image.load(file_path).convert_alpha()
                         # 将头像缩放为圆形，大小为200x200
                         img = self._crop_to_circle(img, 200)
                         self.avatar_images[avatar_id] = img
@@ -473,22 +712,27 @@ class DoudizhuGame:
 
     def _crop_to_circle(self, surface: pygame.Surface, diameter: int) -> pygame.Surface:
         """将图片裁剪为圆形"""
-        # 先将图片缩放为正方形
-        surface = pygame.transform.scale(surface, (diameter, diameter))
-        
-        # 创建一个带透明通道的表面
-        circle_surface = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+        # 先将图片缩放为正方形，并转为带透明通道的表面
+        circle_surface = pygame.transform.scale(surface, (diameter, diameter)).convert_alpha()
         
-        # 在circle_surface上绘制圆形
         center = diameter // 2
         radius = diameter // 2
         
-        # 绘制圆形遮罩
-        for x in range(diameter):
-            for y in range(diameter):
-                if (x - center) ** 2 + (y - center) ** 2 <= radius ** 2:
-                    color = surface.get_at((x, y))
-                    circle_surface.set_at((x, y), color)
+        # 绘制圆形遮罩：圆内为不透明白色，圆外全透明。
+        # 逐行填充 (x-c)²+(y-c)²≤r² 的像素区间，与逐像素判断的圆边缘完全一致
+        mask = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+        mask.fill((0, 0, 0, 0))
+        for y in range(diameter):
+            dy2 = (y - center) ** 2
+            if dy2 > radius ** 2:
+                continue
+            half = math.isqrt(radius ** 2 - dy2)
+            x0 = max(0, center - half)
+            x1 = min(diameter - 1, center + half)
+            mask.fill((255, 255, 255, 255), (x0, y, x1 - x0 + 1, 1))
+        
+        # 用遮罩逐通道相乘，圆外像素的透明度变为0
+        circle_surface.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
         
         return circle_surface
 
@@ -511,7 +755,7 @@ class DoudizhuGame:
             text_rect = text.get_rect(center=center)
             surface.blit(text, text_rect)
             
-            self.avatar_images[i] = surface
+            self.avatar_images[i] = surface.convert_alpha()
             print(f"创建默认头像: 玩家{i}")
 
     def _load_bg_image(self):
@@ -524,7 +768,9 @@ class DoudizhuGame:
         
         try:
             bg_image = pygame.image.load(bg_path)
-            self.bg_image = pygame.transform.scale(bg_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
+            # 背景带逐像素透明度，转换为显示格式时必须保留 alpha
+            self.bg_image = pygame.transform.scale(bg_image, (WINDOW_WIDTH, WINDOW_HEIGHT)).convert_alpha()
+            self.bg_image.set_alpha(128)  # 整体50%透明度，pygame 2 会与逐像素透明度叠加；加载时设置一次即可
             print(f"✓ 已加载背景图片: {bg_path}")
         except Exception as e:
             print(f"加载背景图片失败: {e}")
@@ -578,19 +824,38 @@ class DoudizhuGame:
     def _get_card_image(self, card: Card, for_grayscale: bool = False) -> Optional[pygame.Surface]:
         """获取卡牌的图片"""
         value_name = card.value.name
-        
-        if value_name in self.card_images:
-            img = self.card_images[value_name]
-            # 如果需要灰度转换（方片和梅花）
-            if for_grayscale:
-                return self._convert_to_grayscale(img)
-            return img
-        return None
+        img = self.card_images.get(value_name)
+        # 如果需要灰度转换（方片和梅花），首次使用时转换并缓存
+        if img is not None and for_grayscale:
+            gray = self.card_images_gray.get(value_name)
+            if gray is None:
+                gray = self._convert_to_grayscale(img)
+                self.card_images_gray[value_name] = gray
+            return gray
+        return img
+    
+    def _get_font(self, size: int) -> pygame.font.Font:
+        """获取指定字号的牌面字体（首次使用时创建）"""
+        font = self._font_cache.get(size)
+        if font is None:
+            font = pygame.font.Font(self._font_path, size)
+            self._font_cache[size] = font
+        return font
     
     def show_message(self, msg: str, duration: int = 120):
-        """显示游戏信息"""
+        """显示游戏信息，duration 以帧计（按 FPS 换算为截止时间）"""
         self.game_message = msg
-        self.message_timer = duration
+        self._message_surf = self.font_medium.render(msg, True, (255, 255, 100))
+        self._message_rect = self._message_surf.get_rect(center=(WINDOW_WIDTH // 2, 50))
+        self._message_until = pygame.time.get_ticks() + duration * 1000 // FPS
+        self._needs_redraw = True
+    
+    def _expire_message(self):
+        """提示到期后清除，并重绘一帧把它擦掉"""
+        if self._message_until and pygame.time.get_ticks() >= self._message_until:
+            self._message_surf = None
+            self._message_until = 0
+            self._needs_redraw = True
     
     def _format_cards_short(self, cards: List[Card]) -> str:
         """格式化卡牌信息为简短字符串"""
@@ -634,174 +899,33 @@ class DoudizhuGame:
         if not last_cards:  # 第一个出牌的总是有效
             return True
         # 必须是合法的牌型
-        t1, k1 = self.classify_cards(cards)
-        if t1 is None:
+        info = self._play_info(cards)
+        if info[0] == PT_NONE:
             return False
-        # 如果没有上手牌（轮空）则合法
-        if not last_cards:
-            return True
-        # 比较两手牌大小
-        return self._compare_play(cards, last_cards) > 0
+        # 比较两手牌大小（桌面牌的牌型信息通常已缓存）
+        return _compare_plays(*info, *self._play_info(last_cards)) > 0
+    
+    def _play_info(self, cards: List[Card]) -> Tuple[int, any, int]:
+        """返回 (牌型编号, 比较值, 张数)，桌面上那手牌的结果在出牌时已缓存"""
+        if cards is self._last_play_ref and self._last_play_info is not None:
+            return self._last_play_info
+        play_type, key = self.classify_cards(cards)
+        return (play_type.value if play_type else PT_NONE), key, len(cards)
 
-    def classify_cards(self, cards: List[Card]) -> Tuple[PlayType, any]:
+    @staticmethod
+    def classify_cards(cards: List[Card]) -> Tuple[PlayType, any]:
         """识别牌型，返回 (牌型, 比较值)"""
         if not cards:
             return None, None
 
-        values = [c.value for c in cards]
-        counts = Counter(values)
-        unique_values = sorted(set(values), key=lambda v: v.value)
-        length = len(cards)
-
-        # Rocket
-        if length == 2 and CardValue.SMALL_JOKER in counts and CardValue.BIG_JOKER in counts:
-            return PlayType.ROCKET, CardValue.BIG_JOKER.value
-
-        # Single
-        if length == 1:
-            return PlayType.SINGLE, values[0].value
-
-        # Pair
-        if length == 2 and len(counts) == 1:
-            v = next(iter(counts))
-            return PlayType.PAIR, v.value
-
-        # Trio
-        if length == 3 and 3 in counts.values():
-            v = [k for k, cnt in counts.items() if cnt == 3][0]
-            return PlayType.TRIO, v.value
-
-        # Bomb (strictly four of a kind and exactly 4 cards)
-        if length == 4 and 4 in counts.values():
-            v = [k for k, cnt in counts.items() if cnt == 4][0]
-            return PlayType.BOMB, v.value
-
-        # Four with two (四带二)：6张（4+1+1）或8张（4+2+2）
-        if any(cnt == 4 for cnt in counts.values()):
-            four_val = [k for k, cnt in counts.items() if cnt == 4][0]
-            if length == 6:
-                # 4 + 1 + 1
-                others = [k for k, cnt in counts.items() if k != four_val]
-                if len(others) == 2 and all(counts[k] == 1 for k in others):
-                    return PlayType.FOUR_WITH_TWO, four_val.value
-            if length == 8:
-                # 4 + 2 + 2
-                others = [k for k, cnt in counts.items() if k != four_val]
-                if len(others) == 2 and all(counts[k] == 2 for k in others):
-                    return PlayType.FOUR_WITH_TWO, four_val.value
-
-        # 三带一 / 三带一对
-        if 3 in counts.values():
-            trio_val = [k for k, cnt in counts.items() if cnt == 3][0]
-            if length == 4:
-                return PlayType.TRIO_SINGLE, trio_val.value
-            if length == 5:
-                # 3 + 1 + 1 (invalid) or 3 + 2
-                others = [cnt for k, cnt in counts.items() if k != trio_val]
-                if sorted(others) == [2]:
-                    return PlayType.TRIO_PAIR, trio_val.value
-                if sorted(others) == [1, 1]:
-                    return PlayType.TRIO_SINGLE, trio_val.value
-
-        # Pair straight (双顺): 3对或以上连续对子，不能包含2或王
-        pair_vals = [v for v, cnt in counts.items() if cnt >= 2 and v.value < CardValue.TWO.value]
-        pair_vals_sorted = sorted(pair_vals, key=lambda v: v.value)
-        if len(pair_vals_sorted) >= 3:
-            # check consecutive
-            n = len(pair_vals_sorted)
-            # try all possible consecutive runs with exact card length
-            for run_len in range(3, n + 1):
-                for start in range(0, n - run_len + 1):
-                    run = pair_vals_sorted[start:start + run_len]
-                    if all(run[i].value == run[0].value + i for i in range(run_len)):
-                        if length == run_len * 2:
-                            return PlayType.PAIR_STRAIGHT, run[-1].value
-
-        # Single straight (顺子): 5张或以上连续单张，不能包含2或王
-        single_vals = [v for v in unique_values if v.value < CardValue.TWO.value]
-        if len(single_vals) >= 5 and length == len(single_vals):
-            if all(single_vals[i].value == single_vals[0].value + i for i in range(len(single_vals))):
-                return PlayType.STRAIGHT, single_vals[-1].value
-
-        # Plane and plane with wings
-        trio_vals = [v for v, cnt in counts.items() if cnt >= 3 and v.value < CardValue.TWO.value]
-        trio_vals_sorted = sorted(trio_vals, key=lambda v: v.value)
-        if len(trio_vals_sorted) >= 2:
-            n = len(trio_vals_sorted)
-            for run_len in range(2, n + 1):
-                for start in range(0, n - run_len + 1):
-                    run = trio_vals_sorted[start:start + run_len]
-                    if all(run[i].value == run[0].value + i for i in range(run_len)):
-                        base_cards = run_len * 3
-                        # pure plane
-                        if length == base_cards:
-                            return PlayType.PLANE, run[-1].value
-                        # plane + singles (each wing single)
-                        if length == base_cards + run_len:
-                            return PlayType.PLANE_SINGLE, run[-1].value
-                        # plane + pairs (each wing a pair)
-                        if length == base_cards + run_len * 2:
-                            # ensure there are run_len pairs in the rest
-                            rest_counts = {k: cnt for k, cnt in counts.items() if k not in run}
-                            if sum(1 for cnt in rest_counts.values() if cnt >= 2) >= run_len:
-                                return PlayType.PLANE_PAIR, run[-1].value
-
-        return None, None
-
-    def _compare_play(self, cards: List[Card], last_cards: List[Card]) -> int:
-        """比较两手牌的强弱，返回 1=赢, -1=输, 0=无效比较"""
-        if not cards:
-            return -1
-        if not last_cards:
-            return 1
-        type1, key1 = self.classify_cards(cards)
-        type2, key2 = self.classify_cards(last_cards)
-
-        # 如果任一手牌不是合法牌型
-        if type1 is None or type2 is None:
-            return 0
-
-        len1 = len(cards)
-        len2 = len(last_cards)
-
-        # same type must also have compatible lengths
-        if type1 == type2:
-            # 对于顺子/连对/飞机类，长度必须相等
-            if type1 in (PlayType.STRAIGHT, PlayType.PAIR_STRAIGHT, PlayType.PLANE, PlayType.PLANE_PAIR, PlayType.PLANE_SINGLE):
-                if len1 != len2:
-                    return 0
-                # 比较主段最高点
-                return 1 if key1 > key2 else (-1 if key1 < key2 else 0)
-
-            # 四带二按四张部分比较，长度也需相等
-            if type1 == PlayType.FOUR_WITH_TWO:
-                if len1 != len2:
-                    return 0
-                return 1 if key1 > key2 else (-1 if key1 < key2 else 0)
-
-            # 其他普通牌型：长度相等并比较点数
-            if len1 != len2:
-                return 0
-            return 1 if key1 > key2 else (-1 if key1 < key2 else 0)
-
-        # 不同牌型的比较：rocket最大
-        if type1 == PlayType.ROCKET:
-            return 1
-        if type2 == PlayType.ROCKET:
-            return -1
-
-        # 炸弹可以压制除火箭外的任何牌型
-        if type1 == PlayType.BOMB and type2 != PlayType.ROCKET:
-            return 1
-        if type2 == PlayType.BOMB and type1 != PlayType.ROCKET:
-            return -1
-
-        # 其他不同牌型不能相互比较
-        return 0
+        return _classify_counts(count_vector(cards), len(cards))
     
     def get_ai_move(self, player: Player) -> List[Card]:
         """AI玩家出牌逻辑"""
-        opponent_count = sum(1 for p in self.players if len(p.cards) > 0 and p.id != player.id)
+        # 玩家 id 即座位下标，固定三人，直接看另外两家是否还有牌
+        players = self.players
+        opponent_count = ((1 if players[(player.id + 1) % 3].cards else 0)
+                          + (1 if players[(player.id + 2) % 3].cards else 0))
         return DoudizhuAI.get_best_move(
             player.cards, 
             self.table_cards,
@@ -811,20 +935,25 @@ class DoudizhuGame:
     
     def play_card(self, player_id: int, cards: List[Card]) -> bool:
         """出牌"""
+        self._needs_redraw = True
         player = self.players[player_id]
-        print(f"play_card调用: 玩家={player.name}, 牌={[str(c) for c in cards]}")
-        print(f"  玩家手牌数: {len(player.cards)}")
-        print(f"  table_cards: {[str(c) for c in self.table_cards]}")
+        if DEBUG:
+            _dbg(f"play_card调用: 玩家={player.name}, 牌={[str(c) for c in cards]}")
+        _dbg("  玩家手牌数: %d", len(player.cards))
+        if DEBUG:
+            _dbg(f"  table_cards: {[str(c) for c in self.table_cards]}")
 
         if not cards:
-            print(f"  玩家选择不出牌")
+            _dbg("  玩家选择不出牌")
             self.player_passed[player_id] = True
             self.pass_count += 1
-            print(f"  pass_count: {self.pass_count}")
+            _dbg("  pass_count: %d", self.pass_count)
             
             if self.pass_count >= 3:
-                print(f"  所有玩家都跳过，清除桌面牌")
+                _dbg("  所有玩家都跳过，清除桌面牌")
                 self.table_cards = []
+                self._last_play_ref = None
+                self._last_play_info = None
                 self.player_table_cards = {}
                 self.player_passed = {0: False, 1: False, 2: False}
                 self.pass_count = 0
@@ -833,23 +962,28 @@ class DoudizhuGame:
             return True
 
         if not player.can_play(cards):
-            print(f"  can_play失败")
+            _dbg("  can_play失败")
             return False
         
         is_valid = self.is_valid_play(cards, self.table_cards)
-        print(f"  is_valid_play结果: {is_valid}")
+        _dbg("  is_valid_play结果: %s", is_valid)
         if not is_valid:
             return False
         
         if player.remove_cards(cards):
-            print(f"  移除牌成功，剩余手牌数: {len(player.cards)}")
+            _dbg("  移除牌成功，剩余手牌数: %d", len(player.cards))
+            if player_id == 0:
+                self._hand_surface_dirty = True
+            self._last_play_info = self._play_info(cards)
+            self._last_play_ref = cards
             self.table_cards = cards
             self.player_table_cards[player_id] = cards.copy()
             player.last_played_cards = cards
             self.player_passed[player_id] = False
             self.pass_count = 0
             self.last_player_id = player_id
-            print(f"  桌面牌已更新: {[str(c) for c in self.table_cards]}")
+            if DEBUG:
+                _dbg(f"  桌面牌已更新: {[str(c) for c in self.table_cards]}")
 
             self.current_player_id = (self.current_player_id + 1) % 3
 
@@ -859,11 +993,12 @@ class DoudizhuGame:
                 return True
 
             return True
-        print(f"  remove_cards失败")
+        _dbg("  remove_cards失败")
         return False
     
     def skip_turn(self):
         """跳过回合"""
+        self._needs_redraw = True
         self.player_passed[self.current_player_id] = True
         self.pass_count += 1
         self.current_player_id = (self.current_player_id + 1) % 3
@@ -871,6 +1006,8 @@ class DoudizhuGame:
         # 如果其他两个玩家都跳过，清空所有玩家的桌面牌和跳过状态
         if self.pass_count >= 2:
             self.table_cards = []
+            self._last_play_ref = None
+            self._last_play_info = None
             self.player_table_cards = {}
             self.player_passed = {}
             self.pass_count = 0
@@ -891,13 +1028,9 @@ class DoudizhuGame:
     
     def draw(self):
         """绘制游戏画面"""
-        self.screen.fill(BG_COLOR)
-        
-        # 绘制半透明背景图片
-        if self.bg_image:
-            bg_surface = self.bg_image.copy()
-            bg_surface.set_alpha(128)  # 50%透明度
-            self.screen.blit(bg_surface, (0, 0))
+        self._needs_redraw = False
+        # 底色 + 半透明背景图片（已预先合成）
+        self.screen.blit(self._bg_ready, (0, 0))
 
          # 绘制玩家头像和名字
         self._draw_player_avatars()
@@ -917,13 +1050,20 @@ class DoudizhuGame:
         # 绘制按钮
         self._draw_buttons()
         
-        pygame.display.flip()
+        if self._flipped_phase != self.phase:
+            # 阶段切换（新开一局、游戏结束）时整屏刷新
+            pygame.display.flip()
+            self._flipped_phase = self.phase
+        else:
+            # 背景不变，只需更新本帧和上一帧画过的区域（后者用于擦除消失的内容）
+            pygame.display.update(self._dirty + self._last_dirty)
+        self._last_dirty = self._dirty
+        self._dirty = []
     
     def _draw_player_cards(self):
         """绘制玩家卡牌（叠放样式，最右边的牌在最上面）"""
         player = self.players[0]  # 当前人类玩家
         
-        card_y = WINDOW_HEIGHT - CARD_HEIGHT - 70
         num_cards = len(player.cards)
         
         if num_cards == 0:
@@ -932,39 +1072,66 @@ class DoudizhuGame:
         # 计算总宽度：最右边的牌完整显示 + 前面的牌被覆盖2/3
         # 每张牌露出CARD_OVERLAP距离
         total_width = CARD_WIDTH + (num_cards - 1) * CARD_OVERLAP
-        start_x = (WINDOW_WIDTH - total_width) // 2
+        self._ensure_hand_layout()
         
-        # 正序绘制（从索引0到num_cards-1），这样最后绘制的牌在最上面
-        for i in range(num_cards):
-            card_x = start_x + i * CARD_OVERLAP
-            card = player.cards[i]
+        if self._hand_surface_dirty or self._hand_surface is None:
+            # 顶部多留20像素给选中上移的牌
+            strip = pygame.Surface((total_width, CARD_HEIGHT + 20), pygame.SRCALPHA)
             
-            # 选中的卡牌上移
-            offset_y = -20 if i in self.selected_cards else 0
-            self._draw_card(card_x, card_y + offset_y, card, i in self.selected_cards)
-    
-    def _get_card_rect(self, index: int) -> pygame.Rect:
-        """获取卡牌在屏幕上的矩形区域（用于鼠标碰撞检测）"""
-        player = self.players[0]
-        card_y = WINDOW_HEIGHT - CARD_HEIGHT - 70
-        num_cards = len(player.cards)
+            # 正序绘制（从索引0到num_cards-1），这样最后绘制的牌在最上面
+            blit_list = []
+            for i in range(num_cards):
+                card = player.cards[i]
+                
+                # 选中的卡牌上移
+                offset_y = 0 if i in self.selected_cards else 20
+                blit_list.append((self._get_card_face(card, i in self.selected_cards), (i * CARD_OVERLAP, offset_y)))
+            strip.blits(blit_list, doreturn=False)
+            
+            self._hand_surface = strip
+            self._hand_surface_dirty = False
         
+        self._dirty.append(self.screen.blit(self._hand_surface, (self._hand_xs[0], self._hand_card_y - 20)))
+    
+    def _ensure_hand_layout(self):
+        """手牌张数变化时重新计算每张牌的横坐标"""
+        num_cards = len(self.players[0].cards)
+        if num_cards == self._hand_layout_version:
+            return
         # 计算总宽度：最后一张卡牌的完整宽度 + 前面卡牌的重叠宽度
         total_width = CARD_WIDTH + (num_cards - 1) * CARD_OVERLAP
         start_x = (WINDOW_WIDTH - total_width) // 2
-        
-        card_x = start_x + index * CARD_OVERLAP
+        self._hand_xs = [start_x + i * CARD_OVERLAP for i in range(num_cards)]
+        self._hand_layout_version = num_cards
+    
+    def _get_card_rect(self, index: int) -> pygame.Rect:
+        """获取卡牌在屏幕上的矩形区域（用于鼠标碰撞检测）"""
+        self._ensure_hand_layout()
         offset_y = -20 if index in self.selected_cards else 0
-        return pygame.Rect(card_x, card_y + offset_y, CARD_WIDTH, CARD_HEIGHT)
+        return pygame.Rect(self._hand_xs[index], self._hand_card_y + offset_y, CARD_WIDTH, CARD_HEIGHT)
+    
+    def _get_card_face(self, card: Card, highlighted: bool = False) -> pygame.Surface:
+        """获取预先合成的完整牌面，每种 (卡牌, 是否选中) 只合成一次"""
+        key = (card, highlighted)
+        face = self._card_face_cache.get(key)
+        if face is None:
+            face = self._build_card_face(card, highlighted)
+            self._card_face_cache[key] = face
+        return face
     
-    def _draw_card(self, x: int, y: int, card: Card, highlighted: bool = False):
-        """绘制单张卡牌
+    def _build_card_face(self, card: Card, highlighted: bool) -> pygame.Surface:
+        """把底色、图片、文字和边框合成到一张不透明的牌面上"""
+        face = pygame.Surface((CARD_WIDTH, CARD_HEIGHT)).convert()
+        face.blits(self._card_blits(card, highlighted), doreturn=False)
+        return face
+    
+    def _card_blits(self, card: Card, highlighted: bool = False) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """生成单张卡牌的 (表面, 相对牌面的位置) 列表，按顺序 blit 即得到完整牌面
         布局：图片填充整个牌面，文字在左上角竖向排版
         文字使用投射阴影效果，尽可能充满CARD_OVERLAP宽度
         """
-        # 绘制卡牌背景
-        color = (200, 200, 100) if highlighted else (255, 255, 255)
-        pygame.draw.rect(self.screen, color, (x, y, CARD_WIDTH, CARD_HEIGHT))
+        # 卡牌背景
+        blit_list = [(self._card_bg[highlighted], (0, 0))]
         
         # 绘制背景图片（填充整个牌面）
         card_image = self._get_card_image(card, for_grayscale=False)
@@ -975,12 +1142,25 @@ class DoudizhuGame:
             img_height = card_image.get_height()
             
             # 计算图片位置（水平填充，垂直居中）
-            img_x = x + (CARD_WIDTH - img_width) // 2
-            img_y = y + (CARD_HEIGHT - img_height) // 2
+            img_x = (CARD_WIDTH - img_width) // 2
+            img_y = (CARD_HEIGHT - img_height) // 2
             
-            self.screen.blit(card_image, (img_x, img_y))
+            blit_list.append((card_image, (img_x, img_y)))
         
         # 在左上角绘制文字（竖向排版，尽可能充满CARD_OVERLAP宽度）
+        blit_list.extend(self._get_card_text_blits(card))
+        
+        # 卡牌边框
+        blit_list.append((self._card_border, (0, 0)))
+        return blit_list
+    
+    def _get_card_text_blits(self, card: Card) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """卡牌左上角文字（含阴影）的 (表面, 相对牌面的位置) 列表，每种牌只渲染一次"""
+        key = (card.suit, card.value)
+        text_blits = self._card_text_cache.get(key)
+        if text_blits is not None:
+            return text_blits
+        
         text_str = str(card)  # "S\n3" 或 "小\n王" 之类
         lines = text_str.split('\n')
         
@@ -1006,10 +1186,7 @@ class DoudizhuGame:
         # 尝试不同的字体大小，找到最大的能够填充宽度的
         best_font = self.font_small
         for test_size in [40, 36, 32, 28, 24, 20, 16]:
-            test_font = pygame.font.Font(
-                os.path.join(os.path.dirname(__file__), "SourceHanSerifSC.otf"),
-                test_size
-            ) if os.path.exists(os.path.join(os.path.dirname(__file__), "SourceHanSerifSC.otf")) else pygame.font.Font(None, test_size)
+            test_font = self._get_font(test_size)
             
             # 检查每一行的宽度
             max_line_width = 0
@@ -1022,8 +1199,9 @@ class DoudizhuGame:
                 break
         
         # 绘制文字（带投射阴影）
-        text_x = x + 4  # 左上角位置
-        text_y = y + 4
+        text_x = 4  # 左上角位置（相对牌面）
+        text_y = 4
+        text_blits = []
         
         # 根据是否是王牌调整行距
         line_spacing = 40 if card.suit is None else 40
@@ -1031,24 +1209,22 @@ class DoudizhuGame:
         for line_idx, line in enumerate(lines):
             # 绘制阴影文字
             shadow_surface = best_font.render(line, True, shadow_color)
-            self.screen.blit(shadow_surface, (text_x + shadow_offset, text_y + shadow_offset + line_idx * line_spacing))
+            text_blits.append((shadow_surface, (text_x + shadow_offset, text_y + shadow_offset + line_idx * line_spacing)))
             
             # 绘制正常文字
             text_surface = best_font.render(line, True, text_color)
-            self.screen.blit(text_surface, (text_x, text_y + line_idx * line_spacing))
+            text_blits.append((text_surface, (text_x, text_y + line_idx * line_spacing)))
         
-        # 绘制卡牌边框
-        pygame.draw.rect(self.screen, (0, 0, 0), (x, y, CARD_WIDTH, CARD_HEIGHT), 2)
+        self._card_text_cache[key] = text_blits
+        return text_blits
     
     def _draw_table_cards(self):
         """绘制桌面卡牌（每个玩家的牌显示在靠近该玩家的位置）"""
-        print(f"DEBUG _draw_table_cards: player_table_cards={self.player_table_cards}")
+        _dbg("DEBUG _draw_table_cards: player_table_cards=%s", self.player_table_cards)
         
         if not self.player_table_cards and not self.player_passed:
             return
         
-        font = pygame.font.SysFont('SimHei', 28, bold=True)
-        
         # 绘制每个玩家的出牌或跳过状态
         for player_id in range(3):
             cards = self.player_table_cards.get(player_id, [])
@@ -1067,76 +1243,62 @@ class DoudizhuGame:
             else:
                 continue
             
-            print(f"  玩家{player_id}: cards={len(cards)}, y={table_y}")
+            _dbg("  玩家%d: cards=%d, y=%d", player_id, len(cards), table_y)
             
             if passed:
-                text_surf = font.render("跳过", True, (150, 150, 150))
+                text_surf = self._pass_text_surf
                 text_rect = text_surf.get_rect(center=(center_x, table_y + CARD_HEIGHT // 2))
-                self.screen.blit(text_surf, text_rect)
+                self._dirty.append(self.screen.blit(text_surf, text_rect))
             elif cards:
                 num_cards = len(cards)
                 total_width = CARD_WIDTH + (num_cards - 1) * CARD_OVERLAP
                 start_x = center_x - total_width // 2
                 
+                blit_list = []
                 for i in range(num_cards):
                     card_x = start_x + i * CARD_OVERLAP
                     card = cards[i]
-                    self._draw_card(card_x, table_y, card)
+                    blit_list.append((self._get_card_face(card), (card_x, table_y)))
+                self.screen.blits(blit_list, doreturn=False)
+                self._dirty.append(pygame.Rect(start_x, table_y, total_width, CARD_HEIGHT))
+    
+    def _build_avatar_blits(self):
+        """预先排好头像和名字的 blit 列表；名字和位置开局后不变，只需算一次"""
+        avatar_size = 200  # 头像直径
+        
+        # 玩家0（你）左下角，名字在头像上方；玩家1（电脑1）左上角、玩家2（电脑2）右上角，名字在头像下方
+        positions = {
+            0: (20, WINDOW_HEIGHT - avatar_size - 20),
+            1: (20, 20),
+            2: (WINDOW_WIDTH - avatar_size - 20, 20),
+        }
+        
+        self._avatar_blits = []
+        self._avatar_centers = {}
+        for player_id, (x, y) in positions.items():
+            if player_id in self.avatar_images:
+                self._avatar_blits.append((self.avatar_images[player_id], (x, y)))
+            self._avatar_centers[player_id] = (x + avatar_size//2, y + avatar_size//2)
+            
+            name_surf = self._render_name_fit(self.players[player_id].name, avatar_size + 40)
+            if player_id == 0:
+                name_rect = name_surf.get_rect(midbottom=(x + avatar_size//2, y - 5))
+            else:
+                name_rect = name_surf.get_rect(midtop=(x + avatar_size//2, y + avatar_size + 5))
+            self._avatar_blits.append((name_surf, name_rect))
     
     def _draw_player_avatars(self):
         """绘制玩家头像和名字"""
         avatar_size = 200  # 头像直径
         
-        # 玩家0（你） - 左下角
-        player0_x = 20
-        player0_y = WINDOW_HEIGHT - avatar_size - 20
-        if 0 in self.avatar_images:
-            self.screen.blit(self.avatar_images[0], (player0_x, player0_y))
-        
-        # 绘制边框（如果是当前玩家）
-        if self.current_player_id == 0:
-            pygame.draw.circle(self.screen, (255, 255, 0), 
-                            (player0_x + avatar_size//2, player0_y + avatar_size//2), 
-                            avatar_size//2 + 3, 3)
-        
-        # 绘制玩家0名字（头像上方）
-        name_surf = self._render_name_fit(self.players[0].name, avatar_size + 40)
-        name_rect = name_surf.get_rect(midbottom=(player0_x + avatar_size//2, player0_y - 5))
-        self.screen.blit(name_surf, name_rect)
-        
-        # 玩家1（电脑1） - 左上角
-        player1_x = 20
-        player1_y = 20
-        if 1 in self.avatar_images:
-            self.screen.blit(self.avatar_images[1], (player1_x, player1_y))
-        
-        # 绘制边框（如果是当前玩家）
-        if self.current_player_id == 1:
-            pygame.draw.circle(self.screen, (255, 255, 0), 
-                            (player1_x + avatar_size//2, player1_y + avatar_size//2), 
-                            avatar_size//2 + 3, 3)
-        
-        # 绘制玩家1名字（头像下方）
-        name_surf = self._render_name_fit(self.players[1].name, avatar_size + 40)
-        name_rect = name_surf.get_rect(midtop=(player1_x + avatar_size//2, player1_y + avatar_size + 5))
-        self.screen.blit(name_surf, name_rect)
-        
-        # 玩家2（电脑2） - 右上角
-        player2_x = WINDOW_WIDTH - avatar_size - 20
-        player2_y = 20
-        if 2 in self.avatar_images:
-            self.screen.blit(self.avatar_images[2], (player2_x, player2_y))
-        
-        # 绘制边框（如果是当前玩家）
-        if self.current_player_id == 2:
-            pygame.draw.circle(self.screen, (255, 255, 0), 
-                            (player2_x + avatar_size//2, player2_y + avatar_size//2), 
-                            avatar_size//2 + 3, 3)
-        
-        # 绘制玩家2名字（头像下方）
-        name_surf = self._render_name_fit(self.players[2].name, avatar_size + 40)
-        name_rect = name_surf.get_rect(midtop=(player2_x + avatar_size//2, player2_y + avatar_size + 5))
-        self.screen.blit(name_surf, name_rect)
+        # 头像和名字互不重叠，一次 blits 提交
+        self._dirty.extend(self.screen.blits(self._avatar_blits))
+        
+        # 绘制边框（当前玩家）
+        center = self._avatar_centers.get(self.current_player_id)
+        if center is not None:
+            self._dirty.append(pygame.draw.circle(self.screen, (255, 255, 0), center,
+                                                  avatar_size//2 + 3, 3))
     
     def _draw_phase_info(self):
         """绘制游戏阶段信息"""
@@ -1152,7 +1314,7 @@ class DoudizhuGame:
             if p.is_landlord:
                 label += " (地主)"
             surf = self.font_small.render(label, True, (0, 0, 0))
-            self.screen.blit(surf, (x, y))
+            self._dirty.append(self.screen.blit(surf, (x, y)))
             y += 28
     
     def _draw_buttons(self):
@@ -1168,11 +1330,15 @@ class DoudizhuGame:
             restart_text = self.font_large.render("重开一局", True, TEXT_COLOR)
             restart_text_rect = restart_text.get_rect(center=self.restart_button.center)
             self.screen.blit(restart_text, restart_text_rect)
+            self._dirty.append(self.restart_button)
             return
         
         if self.phase != GamePhase.PLAYING:
             return
         
+        self._dirty.append(self.play_button)
+        self._dirty.append(self.skip_button)
+        
         button_color = BUTTON_HOVER_COLOR if self.button_hover == "play" else BUTTON_COLOR
         pygame.draw.rect(self.screen, button_color, self.play_button)
         pygame.draw.rect(self.screen, (255, 255, 255), self.play_button, 2)
@@ -1188,14 +1354,12 @@ class DoudizhuGame:
         self.screen.blit(skip_text, skip_text_rect)
         
         # 显示游戏信息
-        if self.message_timer > 0:
-            msg_surface = self.font_medium.render(self.game_message, True, (255, 255, 100))
-            msg_rect = msg_surface.get_rect(center=(WINDOW_WIDTH // 2, 50))
-            self.screen.blit(msg_surface, msg_rect)
-            self.message_timer -= 1
+        if self._message_surf is not None:
+            self._dirty.append(self.screen.blit(self._message_surf, self._message_rect))
     
     def handle_mouse_click(self, pos: Tuple[int, int]):
         """处理鼠标点击"""
+        self._needs_redraw = True
         if self.phase == GamePhase.GAME_OVER:
             if self.restart_button.collidepoint(pos):
                 self._init_game()
@@ -1211,30 +1375,42 @@ class DoudizhuGame:
                 return
         
         if self.phase == GamePhase.PLAYING and self.players[0].id == self.current_player_id:
-            for i in range(len(self.players[0].cards) - 1, -1, -1):
+            num_cards = len(self.players[0].cards)
+            if num_cards == 0:
+                return
+            self._ensure_hand_layout()
+            rel = pos[0] - self._hand_xs[0]
+            if rel < 0 or rel >= CARD_WIDTH + (num_cards - 1) * CARD_OVERLAP:
+                return
+            # 横坐标直接算出可能被点中的几张牌（牌宽大于重叠距离，最多两三张），
+            # 从最上层往下逐个检查，不再扫描整手牌
+            top = min(num_cards - 1, rel // CARD_OVERLAP)
+            bottom = max(0, (rel - CARD_WIDTH) // CARD_OVERLAP + 1)
+            for i in range(top, bottom - 1, -1):
                 card_rect = self._get_card_rect(i)
                 if card_rect.collidepoint(pos):
                     if i in self.selected_cards:
                         self.selected_cards.remove(i)
                     else:
-                        self.selected_cards.add(i)
+                        insort(self.selected_cards, i)
+                    self._hand_surface_dirty = True
                     return
     
     def handle_mouse_motion(self, pos: Tuple[int, int]):
         """处理鼠标移动"""
         if self.phase == GamePhase.GAME_OVER:
-            if self.restart_button.collidepoint(pos):
-                self.button_hover = "restart"
-            else:
-                self.button_hover = None
-            return
-        
-        if self.play_button.collidepoint(pos):
-            self.button_hover = "play"
+            hover = "restart" if self.restart_button.collidepoint(pos) else None
+        elif self.play_button.collidepoint(pos):
+            hover = "play"
         elif self.skip_button.collidepoint(pos):
-            self.button_hover = "skip"
+            hover = "skip"
         else:
-            self.button_hover = None
+            hover = None
+        
+        # 悬停按钮变化时才需要重绘
+        if hover != self.button_hover:
+            self.button_hover = hover
+            self._needs_redraw = True
     
     def _try_play_cards(self):
         """尝试出牌"""
@@ -1243,54 +1419,87 @@ class DoudizhuGame:
             return
         
         player = self.players[0]
-        cards_to_play = [player.cards[i] for i in sorted(self.selected_cards)]
+        # 选中索引始终有序，出牌顺序与手牌一致，不用再排序
+        cards_to_play = [player.cards[i] for i in self.selected_cards]
         
         if self.is_valid_play(cards_to_play, self.table_cards):
             if self.play_card(0, cards_to_play):
                 self.selected_cards.clear()
+                self._hand_surface_dirty = True
                 self.show_message("出牌成功！", 60)
         else:
             self.show_message("出牌无效！请检查卡牌组合", 60)
     
+    def _update_ai(self):
+        """AI 出牌调度：轮到 AI 时先在后台线程计算，停顿时间到了再出牌，不阻塞事件循环"""
+        if self.phase != GamePhase.PLAYING or not self.players[self.current_player_id].is_ai:
+            self._ai_move_at = None
+            self._ai_future = None
+            return
+        
+        player = self.players[self.current_player_id]
+        if self._ai_move_at is None:
+            self._ai_move_at = pygame.time.get_ticks() + AI_MOVE_DELAY
+            self._ai_future = self._ai_executor.submit(self.get_ai_move, player)
+            return
+        
+        if pygame.time.get_ticks() < self._ai_move_at:
+            return
+        
+        cards = self._ai_future.result()
+        self._ai_move_at = None
+        self._ai_future = None
+        if DEBUG:
+            _dbg(f"AI {player.name} 出牌: {[str(c) for c in cards]}")
+        if cards:
+            result = self.play_card(player.id, cards)
+            _dbg("play_card结果: %s", result)
+            cards_str = self._format_cards_short(cards)
+            self.show_message(f"{player.name}出了{len(cards)}张牌: {cards_str}", 60)
+        else:
+            self.skip_turn()
+            self.show_message(f"{player.name}跳过了", 60)
+    
     def run(self):
         """运行游戏"""
         running = True
         
         while running:
+            # 每帧一次性取出全部事件，鼠标移动只保留最后一次
+            last_motion = None
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 
-                if event.type == pygame.KEYDOWN:
+                elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         running = False
                 
-                if event.type == pygame.MOUSEBUTTONDOWN:
+                elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # 左键
                         self.handle_mouse_click(event.pos)
                 
-                if event.type == pygame.MOUSEMOTION:
-                    self.handle_mouse_motion(event.pos)
+                elif event.type == pygame.MOUSEMOTION:
+                    last_motion = event
+                
+                elif event.type == pygame.VIDEOEXPOSE:
+                    # 窗口被遮挡后重新显示，需要整屏刷新
+                    self._flipped_phase = None
+                    self._needs_redraw = True
+            
+            if last_motion is not None:
+                self.handle_mouse_motion(last_motion.pos)
             
             # AI玩家自动出牌
-            if self.phase == GamePhase.PLAYING:
-                player = self.players[self.current_player_id]
-                if player.is_ai:
-                    pygame.time.delay(2000)  # 延迟800ms让游戏看起来更自然
-                    cards = self.get_ai_move(player)
-                    print(f"AI {player.name} 出牌: {[str(c) for c in cards]}")
-                    if cards:
-                        result = self.play_card(player.id, cards)
-                        print(f"play_card结果: {result}")
-                        cards_str = self._format_cards_short(cards)
-                        self.show_message(f"{player.name}出了{len(cards)}张牌: {cards_str}", 60)
-                    else:
-                        self.skip_turn()
-                        self.show_message(f"{player.name}跳过了", 60)
+            self._update_ai()
+            self._expire_message()
             
-            self.draw()
+            # 画面无变化时跳过绘制
+            if self._needs_redraw:
+                self.draw()
             self.clock.tick(FPS)
         
+        self._ai_executor.shutdown(wait=False)
         pygame.quit()
         sys.exit()
 
@@ -2,8 +2,8 @@
 斗地主共享类型定义
 """
 from enum import Enum
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple, ClassVar
 
 
 class Suit(Enum):
@@ -50,11 +50,58 @@ class PlayType(Enum):
     ROCKET = 13
 
 
-@dataclass
+# 牌型的整数编号，供热点路径直接做整数比较（0 表示非法牌型）
+PT_NONE = 0
+PT_SINGLE = PlayType.SINGLE.value
+PT_PAIR = PlayType.PAIR.value
+PT_TRIO = PlayType.TRIO.value
+PT_TRIO_SINGLE = PlayType.TRIO_SINGLE.value
+PT_TRIO_PAIR = PlayType.TRIO_PAIR.value
+PT_STRAIGHT = PlayType.STRAIGHT.value
+PT_PAIR_STRAIGHT = PlayType.PAIR_STRAIGHT.value
+PT_PLANE = PlayType.PLANE.value
+PT_PLANE_SINGLE = PlayType.PLANE_SINGLE.value
+PT_PLANE_PAIR = PlayType.PLANE_PAIR.value
+PT_FOUR_WITH_TWO = PlayType.FOUR_WITH_TWO.value
+PT_BOMB = PlayType.BOMB.value
+PT_ROCKET = PlayType.ROCKET.value
+
+
+# 同一牌值内的花色顺序（与按花色符号排序一致）
+SUIT_ORDER: Dict[Suit, int] = {suit: order for order, suit in enumerate(sorted(Suit, key=lambda s: s.value), 1)}
+
+
+# 卡牌创建后不可修改；eq=False 保留 object 的身份比较和哈希（配合驻留池使用）
+# init=False：实例只在 __new__ 中初始化一次，驻留池命中时不会再改写共享对象
+@dataclass(frozen=True, slots=True, eq=False, init=False)
 class Card:
     """卡牌类"""
     suit: Optional[Suit]
     value: CardValue
+    sort_key: int = field(repr=False)
+    bit: int = field(repr=False)  # 整副牌中的编号 0..53，用于手牌位掩码
+    
+    # 驻留池：每种 (花色, 牌值) 只有一个实例，比较相等退化为比较身份
+    _pool: ClassVar[Dict[Tuple[Optional[Suit], CardValue], "Card"]] = {}
+    
+    def __new__(cls, suit: Optional[Suit], value: CardValue):
+        card = cls._pool.get((suit, value))
+        if card is None:
+            card = object.__new__(cls)
+            object.__setattr__(card, "suit", suit)
+            object.__setattr__(card, "value", value)
+            # 排序键：先按牌值，再按花色，创建时算好避免排序时反复计算
+            object.__setattr__(card, "sort_key", value.value * 10 + (SUIT_ORDER[suit] if suit else 0))
+            # 编号按 (牌值, 花色) 排列：3..2 每个牌值占4位，小王/大王为 52/53
+            rank = value.value - 3
+            bit = rank * 4 + (SUIT_ORDER[suit] - 1 if suit else 0) if rank < 13 else rank + 39
+            object.__setattr__(card, "bit", bit)
+            cls._pool[(suit, value)] = card
+        return card
+    
+    def __reduce__(self):
+        # 复制/反序列化时同样经过驻留池
+        return Card, (self.suit, self.value)
     
     def __str__(self):
         if self.suit is None:
@@ -76,11 +123,60 @@ class Card:
             Suit.CLUB: "♣"
         }
         return f"{suit_letters[self.suit]}\n{value_names[self.value]}"
-    
-    def __eq__(self, other):
-        if isinstance(other, Card):
-            return self.value == other.value and self.suit == other.suit
-        return False
-    
-    def __hash__(self):
-        return hash((self.suit, self.value))
+
+
+# 计数向量下标：0..12 对应 3..2，13/14 对应小王/大王
+RANK_INDEX: Dict[CardValue, int] = {value: value.value - 3 for value in CardValue}
+RANK_VALUES: Tuple[CardValue, ...] = tuple(CardValue)
+
+# 可以组成顺子的牌值（3..A）对应的位
+STRAIGHT_MASK = (1 << RANK_INDEX[CardValue.TWO]) - 1
+
+# 导入时按长度展开所有连续区间：_SPAN_MASKS[长度] = ((起点, 区间掩码), ...)
+_SPAN_MASKS = {
+    length: tuple((start, ((1 << length) - 1) << start) for start in range(15 - length + 1))
+    for length in range(1, 16)
+}
+
+
+def bit_indices(mask: int) -> List[int]:
+    """掩码中置位的下标，从低到高"""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+
+def find_sequences(mask: int, min_length: int) -> List[Tuple[int, int]]:
+    """找出 mask 中所有长度≥min_length 的连续段，返回 (长度, 起点下标)，按长度、起点排序"""
+    sequences = []
+    for length in range(min_length, mask.bit_count() + 1):
+        found = [(length, start) for start, span in _SPAN_MASKS[length] if mask & span == span]
+        if not found:
+            break
+        sequences.extend(found)
+    return sequences
+
+
+def count_vector(cards: List[Card]) -> List[int]:
+    """统计每种牌值的张数，返回长度为15的计数向量"""
+    counts = [0] * 15
+    for card in cards:
+        counts[RANK_INDEX[card.value]] += 1
+    return counts
+
+
+def hand_mask(cards: List[Card]) -> int:
+    """把一组牌编码为位掩码，第 card.bit 位表示持有该牌"""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.bit
+    return mask
+
+
+def without_cards(cards: List[Card], move: List[Card]) -> List[Card]:
+    """返回 cards 中不属于 move 的牌（保持原顺序），用位掩码代替列表成员检查"""
+    move_mask = hand_mask(move)
+    return [card for card in cards if not move_mask >> card.bit & 1]
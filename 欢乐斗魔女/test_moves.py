@@ -0,0 +1,54 @@
+"""
+出牌枚举测试（python -m unittest test_moves）
+"""
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from shared_types import Card, CardValue, Suit, PlayType
+from doudizhu_game import DoudizhuGame, Player
+
+
+def make_cards(*values_and_suits):
+    """按 (牌值, 花色) 构造卡牌列表"""
+    return [Card(suit, CardValue(value)) for value, suit in values_and_suits]
+
+
+def rank_sets(moves):
+    """把出牌列表归一化为牌值多重集合的集合（忽略花色）"""
+    return {tuple(sorted(card.value.value for card in move)) for move in moves}
+
+
+class PlaneWingsTest(unittest.TestCase):
+    """飞机带翅膀"""
+
+    def setUp(self):
+        # 333444 + 55 + 7
+        self.hand = make_cards(
+            (3, Suit.SPADE), (3, Suit.HEART), (3, Suit.CLUB),
+            (4, Suit.SPADE), (4, Suit.HEART), (4, Suit.CLUB),
+            (5, Suit.SPADE), (5, Suit.HEART), (7, Suit.DIAMOND),
+        )
+        self.player = Player(0, "测试")
+        self.player.add_cards(list(self.hand))
+
+    def test_single_wings_may_share_a_rank(self):
+        moves = rank_sets(self.player.get_all_playable_moves())
+        self.assertIn((3, 3, 3, 4, 4, 4, 5, 5), moves)
+        self.assertIn((3, 3, 3, 4, 4, 4, 5, 7), moves)
+
+    def test_shared_rank_wings_classify_as_plane_single(self):
+        move = [card for card in self.hand if card.value.value != 7]
+        play_type, _ = DoudizhuGame.classify_cards(move)
+        self.assertEqual(play_type, PlayType.PLANE_SINGLE)
+
+    def test_no_duplicate_wing_choices(self):
+        moves = [move for move in self.player.get_all_playable_moves() if len(move) == 8]
+        signatures = [tuple(sorted(card.value.value for card in move)) for move in moves]
+        self.assertEqual(len(signatures), len(set(signatures)))
+
+
+if __name__ == "__main__":
+    unittest.main()
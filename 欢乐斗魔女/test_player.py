@@ -0,0 +1,55 @@
+"""
+玩家手牌测试（python -m unittest test_player）
+"""
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from shared_types import Card, CardValue, Suit, hand_mask
+from doudizhu_game import Player
+
+
+class RemoveCardsTest(unittest.TestCase):
+    """移除卡牌要么全部成功，要么手牌保持不变"""
+
+    def setUp(self):
+        self.player = Player(0, "测试")
+        self.player.add_cards([
+            Card(Suit.SPADE, CardValue.THREE), Card(Suit.HEART, CardValue.THREE),
+            Card(Suit.SPADE, CardValue.FOUR), Card(Suit.CLUB, CardValue.KING),
+            Card(None, CardValue.BIG_JOKER),
+        ])
+
+    def snapshot(self):
+        player = self.player
+        return (list(player.cards), bytes(player.counts), list(player.masks), player.hand_mask,
+                {index: list(cards) for index, cards in player.cards_by_value.items()})
+
+    def test_partial_miss_removes_nothing(self):
+        before = self.snapshot()
+        missing = Card(Suit.DIAMOND, CardValue.FOUR)
+        self.assertFalse(self.player.remove_cards([Card(Suit.SPADE, CardValue.THREE), missing]))
+        self.assertEqual(self.snapshot(), before)
+
+    def test_duplicate_card_removes_nothing(self):
+        before = self.snapshot()
+        card = Card(Suit.CLUB, CardValue.KING)
+        self.assertFalse(self.player.remove_cards([card, card]))
+        self.assertEqual(self.snapshot(), before)
+
+    def test_removal_keeps_counts_and_masks_consistent(self):
+        removed = [Card(Suit.HEART, CardValue.THREE), Card(None, CardValue.BIG_JOKER)]
+        self.assertTrue(self.player.remove_cards(removed))
+
+        fresh = Player(1, "对照")
+        fresh.add_cards([card for card in self.player.cards])
+        self.assertEqual(self.player.cards, fresh.cards)
+        self.assertEqual(bytes(self.player.counts), bytes(fresh.counts))
+        self.assertEqual(list(self.player.masks), list(fresh.masks))
+        self.assertEqual(self.player.hand_mask, hand_mask(fresh.cards))
+
+
+if __name__ == "__main__":
+    unittest.main()